@@ -5,20 +5,46 @@ from __future__ import annotations
 Handles creation and lifecycle of coordinators per config entry.
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 from typing import TypedDict
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, PLATFORMS, UPDATE_INTERVAL_SECONDS, CONF_AIRLABS_API_KEY, SERVICE_GET_FLIGHT_DETAILS
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    UPDATE_INTERVAL_SECONDS,
+    CONF_AIRPORT,
+    CONF_DIRECTION,
+    CONF_AIRLABS_API_KEY,
+    CONF_AIRLABS_MONTHLY_QUOTA,
+    CONF_SCHEDULE_SOURCE,
+    CONF_TIME_FROM,
+    CONF_TIME_TO,
+    DEFAULT_SCHEDULE_SOURCE,
+    SERVICE_GET_FLIGHT_DETAILS,
+    AIRLABS_FLIGHT_DETAILS_MAX_BATCH,
+    AIRPORT_CACHE_STORAGE_KEY,
+    AIRPORT_CACHE_STORAGE_VERSION,
+    HUB_IDLE_CLOSE_SECONDS,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+)
 from .coordinator import AvinorCoordinator
-from .api import AvinorApiClient, AirlabsApiClient
+from .api import AvinorApiClient
+from .cache import AirportMetadataCache
+from .feed import AvinorAirportFeed
+from .hub import ClientHub
+from .scheduling import RefreshStagger
+from .snapshot import SnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +55,98 @@ AvinorConfigEntry = ConfigEntry  # type alias for clarity
 class DomainData(TypedDict):
     coordinator: AvinorCoordinator
     api: AvinorApiClient
+    feed: AvinorAirportFeed | None
+
+
+def _uses_shared_feed(conf: dict) -> bool:
+    """Return True when the entry reads from the shared Avinor airport feed."""
+    source = (conf.get(CONF_SCHEDULE_SOURCE) or DEFAULT_SCHEDULE_SOURCE).strip().lower()
+    return source == "avinor"
+
+
+async def _async_get_client_hub(hass: HomeAssistant) -> ClientHub:
+    """Return the domain-wide API clients, creating them on first use.
+
+    The clients use Home Assistant's shared client session. They are dropped
+    (with their caches) a minute after the last entry unloads, so reloads
+    keep them.
+    """
+    domain_store = hass.data.setdefault(DOMAIN, {})
+    hub = domain_store.get("clients")
+    if hub is None:
+        airport_cache = AirportMetadataCache(store=Store(hass, AIRPORT_CACHE_STORAGE_VERSION, AIRPORT_CACHE_STORAGE_KEY))
+        hub = domain_store["clients"] = ClientHub(
+            async_get_clientsession(hass), airport_cache=airport_cache, owns_session=False
+        )
+    await hub.airport_cache.async_load()
+    return hub
+
+
+def _async_acquire_client_hub(hass: HomeAssistant, hub: ClientHub) -> None:
+    """Hold the clients for an entry, keeping them past a pending idle drop."""
+    hub.acquire()
+    if (cancel_idle := hass.data[DOMAIN].pop("clients_idle", None)) is not None:
+        cancel_idle()
+
+
+def _async_release_client_hub(hass: HomeAssistant, hub: ClientHub) -> None:
+    """Release an entry's hold on the clients; drop them once unused for a while."""
+    if not hub.release():
+        return
+    domain_store = hass.data[DOMAIN]
+
+    @callback
+    def _async_drop_idle(_now: datetime) -> None:
+        domain_store.pop("clients_idle", None)
+        if domain_store.get("clients") is hub and not hub.in_use:
+            domain_store.pop("clients")
+
+    domain_store["clients_idle"] = async_call_later(hass, HUB_IDLE_CLOSE_SECONDS, _async_drop_idle)
+
+
+def _async_get_refresh_stagger(hass: HomeAssistant) -> RefreshStagger:
+    """Return the domain-wide refresh stagger, creating it on first use."""
+    domain_store = hass.data.setdefault(DOMAIN, {})
+    stagger = domain_store.get("stagger")
+    if stagger is None:
+        stagger = domain_store["stagger"] = RefreshStagger()
+    return stagger
+
+
+async def _async_get_snapshot_store(hass: HomeAssistant) -> SnapshotStore:
+    """Return the domain-wide store of persisted entry snapshots, loading it once."""
+    domain_store = hass.data.setdefault(DOMAIN, {})
+    snapshots = domain_store.get("snapshots")
+    if snapshots is None:
+        snapshots = domain_store["snapshots"] = SnapshotStore(
+            Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY)
+        )
+    await snapshots.async_load()
+    return snapshots
+
+
+def _snapshot_source(conf: dict) -> str:
+    """Fingerprint of the query a snapshot answers; a changed option invalidates it."""
+    source = (conf.get(CONF_SCHEDULE_SOURCE) or DEFAULT_SCHEDULE_SOURCE).strip().lower()
+    return ":".join(
+        str(part)
+        for part in (
+            source,
+            conf.get(CONF_AIRPORT),
+            conf.get(CONF_DIRECTION),
+            conf.get(CONF_TIME_FROM),
+            conf.get(CONF_TIME_TO),
+        )
+    )
+
+
+_FLIGHT_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("flight_iata"): vol.Coerce(str),
+        vol.Optional("flight_icao"): vol.Coerce(str),
+        vol.Optional("flight_number"): vol.Coerce(str),
+    }
+)
 
 
 def _async_register_services(hass: HomeAssistant) -> None:
@@ -45,6 +163,13 @@ def _async_register_services(hass: HomeAssistant) -> None:
             vol.Optional("flight_iata"): vol.Coerce(str),
             vol.Optional("flight_icao"): vol.Coerce(str),
             vol.Optional("flight_number"): vol.Coerce(str),
+            # Batch lookup: IATA flight ids or {flight_iata|flight_icao|flight_number} items.
+            vol.Optional("flights"): vol.All(
+                lambda value: value if isinstance(value, list) else [value],
+                vol.Length(max=AIRLABS_FLIGHT_DETAILS_MAX_BATCH),
+                # Only plain ids are coerced; a bad query dict must fail, not be stringified.
+                [vol.Any(_FLIGHT_QUERY_SCHEMA, vol.All(vol.Any(str, int), vol.Coerce(str)))],
+            ),
         }
     )
 
@@ -55,7 +180,10 @@ def _async_register_services(hass: HomeAssistant) -> None:
         flight_iata = call.data.get("flight_iata")
         flight_icao = call.data.get("flight_icao")
         flight_number = call.data.get("flight_number")
+        flights = call.data.get("flights")
 
+        hub = await _async_get_client_hub(hass)
+        budget = hub.budget
         if not api_key:
             # Find an entry holding an Airlabs key.
             entries = hass.config_entries.async_entries(DOMAIN)
@@ -67,6 +195,8 @@ def _async_register_services(hass: HomeAssistant) -> None:
                 key = conf.get(CONF_AIRLABS_API_KEY)
                 if key:
                     api_key = key
+                    if conf.get(CONF_AIRLABS_MONTHLY_QUOTA):
+                        budget.configure(key, monthly_quota=conf[CONF_AIRLABS_MONTHLY_QUOTA])
                     break
 
         if not api_key:
@@ -74,18 +204,26 @@ def _async_register_services(hass: HomeAssistant) -> None:
                 "No Airlabs API key configured. Add it in the integration options, or pass api_key in the service call."
             )
 
-        session = async_get_clientsession(hass)
-        client = AirlabsApiClient(session)
+        client = hub.airlabs
         try:
-            details = await client.async_get_flight_details(
-                api_key=api_key,
-                flight_iata=flight_iata,
-                flight_icao=flight_icao,
-                flight_number=flight_number,
-            )
+            if flights is not None:
+                if flight_iata or flight_icao or flight_number:
+                    flights = [
+                        *flights,
+                        {"flight_iata": flight_iata, "flight_icao": flight_icao, "flight_number": flight_number},
+                    ]
+                # Keyed by flight identifier: {"flights": {"DY123": {...}, ...}}
+                details = {"flights": await client.async_get_many_flight_details(api_key=api_key, flights=flights)}
+            else:
+                details = await client.async_get_flight_details(
+                    api_key=api_key,
+                    flight_iata=flight_iata,
+                    flight_icao=flight_icao,
+                    flight_number=flight_number,
+                )
         except ValueError as err:
             raise HomeAssistantError(str(err)) from err
-        except RuntimeError as err:
+        except RuntimeError as err:  # includes AirlabsBudgetExceeded
             raise HomeAssistantError(str(err)) from err
 
         # Always store last result for convenience/debugging.
@@ -124,12 +262,38 @@ def _async_register_services(hass: HomeAssistant) -> None:
 
 async def async_setup_entry(hass: HomeAssistant, entry: AvinorConfigEntry) -> bool:
     """Set up Avinor Flight Data from a config entry."""
-    session = async_get_clientsession(hass)
-    api = AvinorApiClient(session)
-    airlabs_api = AirlabsApiClient(session)
+    hub = await _async_get_client_hub(hass)
+    _async_acquire_client_hub(hass, hub)
+    api = hub.avinor
+    budget = hub.budget
 
     # Merge options over data so updated options take effect on reloads
     conf = {**entry.data, **entry.options}
+    # Only Airlabs entries load the Airlabs client.
+    airlabs_api = hub.airlabs if conf.get(CONF_SCHEDULE_SOURCE) == "airlabs" else None
+
+    # Airlabs polling draws from the shared per-key request budget.
+    airlabs_key = conf.get(CONF_AIRLABS_API_KEY)
+    if airlabs_key:
+        budget.configure(airlabs_key, monthly_quota=conf.get(CONF_AIRLABS_MONTHLY_QUOTA))
+        if conf.get(CONF_SCHEDULE_SOURCE) == "airlabs":
+            budget.register_poller(airlabs_key, entry.entry_id)
+
+    # Entries for the same airport share one XmlFeed download.
+    feed = None
+    if _uses_shared_feed(conf):
+        feed = hub.feeds.subscribe(
+            entry.entry_id,
+            airport=conf[CONF_AIRPORT],
+            time_from=conf.get(CONF_TIME_FROM),
+            time_to=conf.get(CONF_TIME_TO),
+        )
+
+    # Spread refreshes across entries; entries sharing a feed refresh together.
+    stagger_group = f"feed:{feed.airport}" if feed is not None else f"entry:{entry.entry_id}"
+    stagger = _async_get_refresh_stagger(hass).register(stagger_group, entry.entry_id)
+
+    snapshots = await _async_get_snapshot_store(hass)
 
     coordinator = AvinorCoordinator(
         hass,
@@ -137,13 +301,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: AvinorConfigEntry) -> bo
         airlabs_api,
         conf,
         update_interval=timedelta(seconds=UPDATE_INTERVAL_SECONDS),
+        feed=feed,
+        budget=budget,
+        stagger=stagger,
+        snapshot=snapshots.slot(entry.entry_id, source=_snapshot_source(conf)),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Entities start from a recent snapshot, or as loading without one. The
+    # first fetch runs in the background, at the entry's stagger slot, so
+    # setup never waits on upstream latency and a restart doesn't fire every
+    # entry at once; it is cancelled if the entry unloads first.
+    restored = coordinator.restore_snapshot()
+    entry.async_create_background_task(
+        hass, coordinator.async_first_refresh(restored=restored), f"{DOMAIN} first refresh {entry.entry_id}"
+    )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = DomainData(
         coordinator=coordinator,
         api=api,
+        feed=feed,
     )
 
     _async_register_services(hass)
@@ -158,7 +334,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: AvinorConfigEntry) -> b
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+
+        # Options may already point at another airport; release the one we subscribed to.
+        feed = data.get("feed") if data else None
+        hub: ClientHub | None = hass.data[DOMAIN].get("clients")
+        if hub is not None:
+            if feed is not None:
+                hub.feeds.unsubscribe(entry.entry_id, airport=feed.airport)
+            hub.budget.unregister_poller(entry.entry_id)
+            _async_release_client_hub(hass, hub)
+        _async_get_refresh_stagger(hass).unregister(entry.entry_id)
 
         # Remove services when the last entry is unloaded.
         if not hass.config_entries.async_entries(DOMAIN):
@@ -170,6 +356,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: AvinorConfigEntry) -> b
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: AvinorConfigEntry) -> None:
+    """Drop the persisted snapshot of a deleted entry."""
+    snapshots = await _async_get_snapshot_store(hass)
+    snapshots.remove(entry.entry_id)
+
+
 async def async_update_listener(hass: HomeAssistant, entry: AvinorConfigEntry) -> None:
     """Handle options update: reload the entry."""
     await hass.config_entries.async_reload(entry.entry_id)
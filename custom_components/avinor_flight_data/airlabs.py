@@ -0,0 +1,519 @@
+from __future__ import annotations
+
+"""Airlabs Flight API client (JSON), for schedules and flight details."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import aiohttp
+
+from .const import (
+    AIRLABS_API_BASE,
+    AIRLABS_API_AIRPORTS,
+    AIRLABS_API_FLIGHT_DETAILS,
+    AIRLABS_API_SCHEDULES,
+    AIRLABS_AIRPORT_LOOKUP_CONCURRENCY,
+    AIRLABS_FLIGHT_DETAILS_CONCURRENCY,
+    AIRLABS_SCHEDULES_MAX_PAGES,
+    AIRLABS_SCHEDULES_PAGE_SIZE,
+    AIRLABS_SCHEDULES_PARALLEL_PAGES,
+)
+from .breaker import CircuitBreakerRegistry, CircuitOpenError, guard
+from .cache import AirportMetadataCache, ResponseCache, cached
+from .models import FlightRecord
+from .quota import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, AirlabsBudgetExceeded, AirlabsQuotaScheduler
+from .singleflight import SingleFlight, coalesce, request_key
+
+_LOGGER = logging.getLogger(__name__)
+
+NORWAY_COUNTRY_CODE = "NO"
+SCHENGEN_COUNTRY_CODES = {
+    "AT", "BE", "CH", "CZ", "DE", "DK", "EE", "ES", "FI", "FR", "GR", "HR",
+    "HU", "IS", "IT", "LT", "LU", "LV", "MT", "NL", "PL", "PT", "SE", "SI", "SK",
+}
+
+
+class AirlabsApiClient:
+    """Simple async client for Airlabs Flight API (JSON).
+
+    Airport metadata lookups run concurrently, at most
+    `airport_lookup_concurrency` at a time, and concurrent lookups for the
+    same code share one request. Pass a shared `airport_cache` to reuse
+    metadata across clients and restarts. Schedules are paginated, with up to
+    `schedules_parallel_pages` follow-up pages requested at once. With a
+    `budget`, every request first takes a token from the shared Airlabs quota
+    scheduler; flight details rank as interactive, the rest as background.
+    Shared `breakers` make requests fail fast while Airlabs is down, and
+    identical concurrent requests share one call (and one budget token)
+    through `single_flight`. Responses found in a shared `response_cache`
+    cost no request and no token. `base_url` points the client at another
+    server, such as a local stand-in.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        airport_cache: AirportMetadataCache | None = None,
+        airport_lookup_concurrency: int = AIRLABS_AIRPORT_LOOKUP_CONCURRENCY,
+        schedules_parallel_pages: int = AIRLABS_SCHEDULES_PARALLEL_PAGES,
+        budget: AirlabsQuotaScheduler | None = None,
+        breakers: CircuitBreakerRegistry | None = None,
+        single_flight: SingleFlight | None = None,
+        response_cache: ResponseCache | None = None,
+        base_url: str = AIRLABS_API_BASE,
+    ) -> None:
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._budget = budget
+        self._breakers = breakers
+        self._single_flight = single_flight if single_flight is not None else SingleFlight()
+        self._response_cache = response_cache
+        self._schedules_parallel_pages = max(int(schedules_parallel_pages), 1)
+        self._airport_cache = airport_cache if airport_cache is not None else AirportMetadataCache()
+        self._airport_semaphore = asyncio.Semaphore(max(int(airport_lookup_concurrency), 1))
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        try:
+            _LOGGER.debug("Airlabs request: url=%s params=%s", url, {k: v for k, v in (params or {}).items() if k != "api_key"})
+            with guard(self._breakers, url):
+                async with asyncio.timeout(30):
+                    async with self._session.get(
+                        url,
+                        params=params,
+                        headers={"Accept": "application/json"},
+                    ) as resp:
+                        resp.raise_for_status()
+                        return await resp.json(content_type=None)
+        except asyncio.TimeoutError as err:
+            _LOGGER.error("Airlabs API timeout fetching %s: %s", url, err)
+            raise
+        except aiohttp.ClientResponseError as err:
+            _LOGGER.error("Airlabs API HTTP error (%s) for %s: %s", err.status, url, err)
+            raise
+        except aiohttp.ClientConnectionError as err:
+            _LOGGER.error("Airlabs API connection error for %s: %s", url, err)
+            raise
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Airlabs API client error for %s: %s", url, err)
+            raise
+
+    async def _get_budgeted_json(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        *,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> Dict[str, Any]:
+        return await cached(
+            self._response_cache,
+            "airlabs_json",
+            url,
+            params,
+            lambda: self._fetch_budgeted_json(url, params, priority=priority),
+            # Error payloads (bad key, quota exceeded, ...) must not stick.
+            cacheable=lambda payload: not (isinstance(payload, dict) and payload.get("error")),
+        )
+
+    async def _fetch_budgeted_json(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        *,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> Dict[str, Any]:
+        """Request `url` (sharing identical in-flight requests), bypassing the response cache."""
+
+        async def fetch() -> Dict[str, Any]:
+            if self._budget is not None:
+                await self._budget.acquire(str(params.get("api_key") or ""), priority=priority)
+            return await self._get_json(url, params=params)
+
+        return await coalesce(self._single_flight, request_key("airlabs_json", url, params), fetch)
+
+    async def async_get_flight_details(
+        self,
+        *,
+        api_key: str,
+        flight_iata: str | None = None,
+        flight_icao: str | None = None,
+        flight_number: str | None = None,
+    ) -> Dict[str, Any]:
+        """Fetch details for a specific flight using Airlabs.
+
+        Uses https://airlabs.co/docs/flight
+
+        One of `flight_iata`, `flight_icao`, or `flight_number` must be provided.
+        Returns the `response` object from Airlabs (or an empty dict if none).
+        """
+
+        if not api_key or not str(api_key).strip():
+            raise ValueError("api_key is required")
+
+        flight_iata = (flight_iata or "").strip() or None
+        flight_icao = (flight_icao or "").strip() or None
+        flight_number = (flight_number or "").strip() or None
+
+        if not (flight_iata or flight_icao or flight_number):
+            raise ValueError("One of flight_iata, flight_icao, flight_number is required")
+
+        params: Dict[str, Any] = {"api_key": api_key}
+        if flight_iata:
+            params["flight_iata"] = flight_iata
+        if flight_icao:
+            params["flight_icao"] = flight_icao
+        if flight_number:
+            params["flight_number"] = flight_number
+
+        url = f"{self._base_url}{AIRLABS_API_FLIGHT_DETAILS}"
+        payload = await self._get_budgeted_json(url, params, priority=PRIORITY_INTERACTIVE)
+
+        # Airlabs typically returns {"request": ..., "response": ..., "error": ...}
+        if isinstance(payload, dict) and payload.get("error"):
+            message = payload.get("message") or payload.get("error")
+            raise RuntimeError(f"Airlabs API error: {message}")
+
+        if isinstance(payload, dict) and "response" in payload:
+            response = payload.get("response")
+            return response if isinstance(response, dict) else {"response": response}
+
+        return payload if isinstance(payload, dict) else {"response": payload}
+
+    async def async_get_many_flight_details(
+        self,
+        *,
+        api_key: str,
+        flights: Sequence[str | Mapping[str, Any]],
+        concurrency: int = AIRLABS_FLIGHT_DETAILS_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch details for several flights, at most `concurrency` at a time.
+
+        Items are IATA flight ids (`"DY123"`) or mappings with `flight_iata`,
+        `flight_icao` or `flight_number`. Returns details keyed by the flight
+        identifier; a flight that could not be fetched maps to `{"error": ...}`.
+        Duplicates are looked up once.
+        """
+
+        if not api_key or not str(api_key).strip():
+            raise ValueError("api_key is required")
+
+        lookups: Dict[str, Dict[str, Any]] = {}
+        for item in flights:
+            query = {"flight_iata": item} if isinstance(item, str) else dict(item)
+            key = next(
+                (str(query[field]).strip() for field in ("flight_iata", "flight_icao", "flight_number") if str(query.get(field) or "").strip()),
+                "",
+            )
+            if key:
+                lookups.setdefault(key, query)
+
+        semaphore = asyncio.Semaphore(max(int(concurrency), 1))
+
+        async def lookup(query: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.async_get_flight_details(
+                        api_key=api_key,
+                        flight_iata=query.get("flight_iata"),
+                        flight_icao=query.get("flight_icao"),
+                        flight_number=query.get("flight_number"),
+                    )
+                except (ValueError, RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    return {"error": str(err) or type(err).__name__}
+
+        results = await asyncio.gather(*(lookup(query) for query in lookups.values()))
+        return dict(zip(lookups, results))
+
+    async def async_get_airport(self, *, api_key: str, iata_code: str) -> Dict[str, Any]:
+        """Fetch airport metadata for one IATA code using Airlabs."""
+
+        code = (iata_code or "").strip().upper()
+        if not code:
+            return {}
+        airport = self._airport_cache.get(code)
+        if airport is not None:
+            return airport
+
+        # Coalesce with an in-flight lookup for the same code.
+        return await coalesce(
+            self._single_flight,
+            ("airlabs_airport", code),
+            lambda: self._fetch_airport(api_key=api_key, code=code),
+        )
+
+    async def _fetch_airport(self, *, api_key: str, code: str) -> Dict[str, Any]:
+        try:
+            async with self._airport_semaphore:
+                payload = await self._get_budgeted_json(
+                    f"{self._base_url}{AIRLABS_API_AIRPORTS}",
+                    {"api_key": api_key, "iata_code": code},
+                )
+        except (AirlabsBudgetExceeded, CircuitOpenError) as err:
+            # Don't fail the schedules poll whose pages are already paid for;
+            # classify without it this time. The breaker logs outages itself.
+            log = _LOGGER.debug if isinstance(err, CircuitOpenError) else _LOGGER.warning
+            log("Airlabs airport lookup for %s skipped: %s", code, err)
+            return {}
+        if isinstance(payload, dict) and payload.get("error"):
+            # Bad key, quota exhausted, ...: classify without it this time, retry later.
+            _LOGGER.warning("Airlabs airport lookup for %s failed: %s", code, payload.get("error"))
+            return {}
+        response = payload.get("response") if isinstance(payload, dict) else None
+        if isinstance(response, list):
+            airport = response[0] if response else {}
+        elif isinstance(response, dict):
+            airport = response
+        else:
+            airport = {}
+        if airport:
+            self._airport_cache[code] = airport
+        return airport
+
+    async def async_get_schedules(
+        self,
+        *,
+        api_key: str,
+        airport: str,
+        direction: Optional[str] = None,
+        time_from: Optional[int] = None,
+        time_to: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Fetch airport schedules from Airlabs and normalize them to integration flight records."""
+
+        if not api_key or not str(api_key).strip():
+            raise ValueError("api_key is required")
+
+        airport = (airport or "").strip().upper()
+        direction = (direction or "A").strip().upper() or "A"
+
+        params: Dict[str, Any] = {
+            "api_key": api_key,
+            "limit": AIRLABS_SCHEDULES_PAGE_SIZE,
+        }
+        if direction == "D":
+            params["dep_iata"] = airport
+        else:
+            params["arr_iata"] = airport
+
+        # Pages are filtered and deduped as they arrive, so only in-window rows are kept.
+        grouped: dict[str, Dict[str, Any]] = {}
+        window_end = datetime.now(timezone.utc) + timedelta(hours=max(int(time_to or 0), 0))
+        # When the oldest page was fetched; cached pages keep their original time.
+        fetched_at: datetime | None = None
+        next_page = 0
+        done = False
+        while not done and next_page < AIRLABS_SCHEDULES_MAX_PAGES:
+            # The first page goes alone; later pages are fetched a batch at a time.
+            batch_size = 1 if next_page == 0 else self._schedules_parallel_pages
+            pages = range(next_page, min(next_page + batch_size, AIRLABS_SCHEDULES_MAX_PAGES))
+            results = await asyncio.gather(
+                *(self._get_schedules_page(params, offset=page * AIRLABS_SCHEDULES_PAGE_SIZE) for page in pages)
+            )
+            next_page = pages.stop
+            for page_fetched_at, rows in results:
+                fetched_at = page_fetched_at if fetched_at is None else min(fetched_at, page_fetched_at)
+                self._merge_schedule_rows(
+                    grouped,
+                    self._filter_schedule_rows(rows, direction=direction, time_from=time_from, time_to=time_to),
+                )
+                if len(rows) < AIRLABS_SCHEDULES_PAGE_SIZE or self._page_past_window(rows, direction, window_end):
+                    done = True
+                    break
+        if not done:
+            _LOGGER.warning(
+                "Airlabs schedules for %s stopped at the %d-page limit; later flights in the window are missing",
+                airport,
+                AIRLABS_SCHEDULES_MAX_PAGES,
+            )
+
+        rows = list(grouped.values())
+        flights = await self._normalize_schedule_rows(api_key=api_key, rows=rows, direction=direction, airport=airport)
+        return {
+            "lastUpdate": (fetched_at or datetime.now(timezone.utc)).isoformat().replace("+00:00", "Z"),
+            "flights": flights,
+        }
+
+    async def _get_schedules_page(self, params: Dict[str, Any], *, offset: int) -> Tuple[datetime, List[Dict[str, Any]]]:
+        """Return one page of schedule rows and when it was fetched from Airlabs."""
+        page_params = dict(params)
+        if offset:
+            page_params["offset"] = offset
+        url = f"{self._base_url}{AIRLABS_API_SCHEDULES}"
+
+        async def fetch() -> Tuple[datetime, List[Dict[str, Any]]]:
+            payload = await self._fetch_budgeted_json(url, page_params)
+            if isinstance(payload, dict) and payload.get("error"):
+                message = payload.get("message") or payload.get("error")
+                raise RuntimeError(f"Airlabs API error: {message}")
+
+            response = payload.get("response") if isinstance(payload, dict) else None
+            return datetime.now(timezone.utc), response if isinstance(response, list) else []
+
+        return await cached(self._response_cache, "airlabs_schedules", url, page_params, fetch)
+
+    def _page_past_window(self, rows: List[Dict[str, Any]], direction: str, window_end: datetime) -> bool:
+        """Return True when a page already ends after the window.
+
+        Airlabs returns schedules in time order, so later pages only hold
+        flights further out.
+        """
+        for row in reversed(rows):
+            schedule_time = self._parse_schedule_datetime(row, direction)
+            if schedule_time is not None:
+                return schedule_time > window_end
+        return False
+
+    def _filter_schedule_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        *,
+        direction: str,
+        time_from: Optional[int],
+        time_to: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(hours=max(int(time_from or 0), 0))
+        window_end = now + timedelta(hours=max(int(time_to or 0), 0))
+        filtered: List[Dict[str, Any]] = []
+        for row in rows:
+            schedule_time = self._parse_schedule_datetime(row, direction)
+            if schedule_time is None:
+                continue
+            if schedule_time < window_start or schedule_time > window_end:
+                continue
+            filtered.append(row)
+        return filtered
+
+    async def _normalize_schedule_rows(
+        self,
+        *,
+        api_key: str,
+        rows: List[Dict[str, Any]],
+        direction: str,
+        airport: str,
+    ) -> List[FlightRecord]:
+        deduped = self._dedupe_schedule_rows(rows)
+        opposite_codes = {
+            self._get_counterparty_airport(row, direction)
+            for row in deduped
+            if self._get_counterparty_airport(row, direction)
+        }
+        # Bundled table first (no quota use); only unknown codes go to Airlabs.
+        from .airport_table import lookup_airport
+
+        airport_meta: dict[str, dict[str, Any]] = {}
+        remote_codes: List[str] = []
+        for code in sorted(opposite_codes):
+            bundled = lookup_airport(code)
+            if bundled is not None:
+                airport_meta[code] = bundled
+            else:
+                remote_codes.append(code)
+        results = await asyncio.gather(
+            *(self.async_get_airport(api_key=api_key, iata_code=code) for code in remote_codes)
+        )
+        airport_meta.update(zip(remote_codes, results))
+
+        flights: List[FlightRecord] = []
+        for row in deduped:
+            other_airport = self._get_counterparty_airport(row, direction)
+            meta = airport_meta.get(other_airport or "", {})
+            airport_display = str(meta.get("name") or other_airport or "")
+            flights.append(
+                FlightRecord(
+                    uniqueId=self._schedule_identity(row),
+                    airline=row.get("airline_iata") or row.get("airline_icao"),
+                    flightId=row.get("flight_iata") or row.get("flight_icao") or row.get("flight_number") or "",
+                    dom_int=self._classify_airlabs_flight(country_code=str(meta.get("country_code") or "").upper(), airport_code=other_airport),
+                    schedule_time=self._schedule_time_utc(row, direction),
+                    arr_dep=direction,
+                    airport=airport_display,
+                    check_in=row.get("dep_gate") if direction == "D" else None,
+                    gate=row.get("arr_gate") if direction == "A" else row.get("dep_gate"),
+                    status_code=self._map_airlabs_status(row.get("status")),
+                    status_time=row.get("arr_actual_utc") if direction == "A" else row.get("dep_actual_utc"),
+                )
+            )
+        return flights
+
+    def _dedupe_schedule_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        grouped: dict[str, Dict[str, Any]] = {}
+        self._merge_schedule_rows(grouped, rows)
+        return list(grouped.values())
+
+    def _merge_schedule_rows(self, grouped: dict[str, Dict[str, Any]], rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            key = self._schedule_identity(row)
+            current = grouped.get(key)
+            if current is None or self._schedule_preference(row) > self._schedule_preference(current):
+                grouped[key] = row
+
+    def _schedule_identity(self, row: Dict[str, Any]) -> str:
+        return "|".join(
+            [
+                str(row.get("cs_flight_iata") or row.get("cs_flight_icao") or row.get("flight_iata") or row.get("flight_icao") or row.get("flight_number") or ""),
+                str(row.get("dep_iata") or row.get("dep_icao") or ""),
+                str(row.get("arr_iata") or row.get("arr_icao") or ""),
+                str(row.get("dep_time_utc") or ""),
+                str(row.get("arr_time_utc") or ""),
+            ]
+        )
+
+    def _schedule_preference(self, row: Dict[str, Any]) -> int:
+        score = 0
+        if not row.get("cs_flight_iata") and not row.get("cs_flight_icao"):
+            score += 10
+        if row.get("flight_iata"):
+            score += 2
+        if row.get("arr_estimated_utc") or row.get("dep_estimated_utc"):
+            score += 1
+        return score
+
+    def _get_counterparty_airport(self, row: Dict[str, Any], direction: str) -> str:
+        if direction == "D":
+            return str(row.get("arr_iata") or row.get("arr_icao") or "").strip().upper()
+        return str(row.get("dep_iata") or row.get("dep_icao") or "").strip().upper()
+
+    def _schedule_time_utc(self, row: Dict[str, Any], direction: str) -> str:
+        if direction == "D":
+            return str(row.get("dep_time_utc") or row.get("dep_estimated_utc") or row.get("dep_time") or "")
+        return str(row.get("arr_time_utc") or row.get("arr_estimated_utc") or row.get("arr_time") or "")
+
+    def _parse_schedule_datetime(self, row: Dict[str, Any], direction: str) -> datetime | None:
+        raw = self._schedule_time_utc(row, direction)
+        if not raw:
+            return None
+        text = raw.strip().replace(" ", "T")
+        if text.endswith("Z"):
+            parsed = text
+        elif "T" in text:
+            parsed = f"{text}Z"
+        else:
+            parsed = text
+        try:
+            return datetime.fromisoformat(parsed.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    def _classify_airlabs_flight(self, *, country_code: str, airport_code: str | None) -> str:
+        if not airport_code:
+            return ""
+        if country_code == NORWAY_COUNTRY_CODE:
+            return "D"
+        if country_code in SCHENGEN_COUNTRY_CODES:
+            return "S"
+        if country_code:
+            return "I"
+        return ""
+
+    def _map_airlabs_status(self, status: Any) -> str:
+        normalized = str(status or "").strip().lower()
+        return {
+            "scheduled": "E",
+            "active": "EXP",
+            "en-route": "EXP",
+            "landed": "A",
+            "cancelled": "C",
+        }.get(normalized, str(status or "").strip().upper())
@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+"""Bundled airport table used to classify Airlabs flights offline.
+
+Maps IATA codes to ISO country code and a display name. The table is parsed
+on first use; codes it does not cover still fall back to the Airlabs
+`/airports` endpoint.
+"""
+
+from typing import Dict, Optional, Tuple
+
+# IATA|country|name, sorted by IATA code.
+_AIRPORTS = """\
+AAL|DK|Aalborg Airport
+AAR|DK|Aarhus Airport
+ABZ|GB|Aberdeen Airport
+ACE|ES|Lanzarote Airport
+ADB|TR|Izmir Airport
+ADD|ET|Addis Ababa Airport
+AES|NO|Ålesund Airport
+AEY|IS|Akureyri Airport
+AGA|MA|Agadir Airport
+AGH|SE|Ängelholm Airport
+AGP|ES|Malaga Airport
+AHO|IT|Alghero Airport
+AJA|FR|Ajaccio Airport
+AKL|NZ|Auckland Airport
+ALC|ES|Alicante Airport
+ALF|NO|Alta Airport
+ALG|DZ|Algiers Airport
+AMM|JO|Amman Queen Alia Airport
+AMS|NL|Amsterdam Schiphol Airport
+ANR|BE|Antwerp Airport
+ANX|NO|Andøya Airport
+AOI|IT|Ancona Airport
+ARN|SE|Stockholm Arlanda Airport
+ATH|GR|Athens Airport
+ATL|US|Atlanta Airport
+AUH|AE|Abu Dhabi Airport
+AYT|TR|Antalya Airport
+BAH|BH|Bahrain Airport
+BCN|ES|Barcelona Airport
+BDS|IT|Brindisi Airport
+BDU|NO|Bardufoss Airport
+BEG|RS|Belgrade Airport
+BER|DE|Berlin Brandenburg Airport
+BES|FR|Brest Airport
+BFS|GB|Belfast International Airport
+BGO|NO|Bergen Airport
+BGY|IT|Milan Bergamo Airport
+BHD|GB|Belfast City Airport
+BHX|GB|Birmingham Airport
+BIA|FR|Bastia Airport
+BIO|ES|Bilbao Airport
+BIQ|FR|Biarritz Airport
+BJF|NO|Båtsfjord Airport
+BJL|GM|Banjul Airport
+BJV|TR|Bodrum Airport
+BKK|TH|Bangkok Suvarnabhumi Airport
+BLL|DK|Billund Airport
+BLQ|IT|Bologna Airport
+BMA|SE|Stockholm Bromma Airport
+BNE|AU|Brisbane Airport
+BNN|NO|Brønnøysund Airport
+BOD|FR|Bordeaux Airport
+BOG|CO|Bogotá Airport
+BOJ|BG|Burgas Airport
+BOM|IN|Mumbai Airport
+BOO|NO|Bodø Airport
+BOS|US|Boston Logan Airport
+BRE|DE|Bremen Airport
+BRI|IT|Bari Airport
+BRN|CH|Bern Airport
+BRQ|CZ|Brno Airport
+BRS|GB|Bristol Airport
+BRU|BE|Brussels Airport
+BTS|SK|Bratislava Airport
+BUD|HU|Budapest Airport
+BVA|FR|Paris Beauvais Airport
+BVC|CV|Boa Vista Airport
+BVG|NO|Berlevåg Airport
+BZG|PL|Bydgoszcz Airport
+CAG|IT|Cagliari Airport
+CAI|EG|Cairo Airport
+CAN|CN|Guangzhou Airport
+CDG|FR|Paris Charles de Gaulle Airport
+CFE|FR|Clermont-Ferrand Airport
+CFU|GR|Corfu Airport
+CGK|ID|Jakarta Airport
+CGN|DE|Cologne Bonn Airport
+CHQ|GR|Chania Airport
+CIA|IT|Rome Ciampino Airport
+CLJ|RO|Cluj-Napoca Airport
+CMB|LK|Colombo Airport
+CMF|FR|Chambéry Airport
+CMN|MA|Casablanca Airport
+CPH|DK|Copenhagen Airport
+CPT|ZA|Cape Town Airport
+CRL|BE|Brussels South Charleroi Airport
+CTA|IT|Catania Airport
+CUF|IT|Cuneo Airport
+CUN|MX|Cancun Airport
+CWL|GB|Cardiff Airport
+DBV|HR|Dubrovnik Airport
+DEB|HU|Debrecen Airport
+DEL|IN|Delhi Airport
+DEN|US|Denver Airport
+DFW|US|Dallas/Fort Worth Airport
+DJE|TN|Djerba Airport
+DLM|TR|Dalaman Airport
+DOH|QA|Doha Hamad Airport
+DPS|ID|Bali Denpasar Airport
+DRS|DE|Dresden Airport
+DTM|DE|Dortmund Airport
+DTW|US|Detroit Airport
+DUB|IE|Dublin Airport
+DUS|DE|Düsseldorf Airport
+DXB|AE|Dubai Airport
+EBJ|DK|Esbjerg Airport
+EDI|GB|Edinburgh Airport
+EFL|GR|Kefalonia Airport
+EIN|NL|Eindhoven Airport
+EMA|GB|East Midlands Airport
+ESB|TR|Ankara Esenboğa Airport
+EVE|NO|Harstad/Narvik Airport
+EVN|AM|Yerevan Airport
+EWR|US|Newark Airport
+EXT|GB|Exeter Airport
+EZE|AR|Buenos Aires Ezeiza Airport
+FAE|FO|Vágar Airport
+FAO|PT|Faro Airport
+FCO|IT|Rome Fiumicino Airport
+FDE|NO|Førde Airport
+FDH|DE|Friedrichshafen Airport
+FKB|DE|Karlsruhe/Baden-Baden Airport
+FLL|US|Fort Lauderdale Airport
+FLR|IT|Florence Airport
+FMM|DE|Memmingen Airport
+FNC|PT|Madeira Airport
+FRA|DE|Frankfurt Airport
+FRO|NO|Florø Airport
+FSC|FR|Figari Airport
+FUE|ES|Fuerteventura Airport
+GCI|GG|Guernsey Airport
+GDN|PL|Gdansk Airport
+GIB|GI|Gibraltar Airport
+GIG|BR|Rio de Janeiro Galeão Airport
+GLA|GB|Glasgow Airport
+GNB|FR|Grenoble Airport
+GOA|IT|Genoa Airport
+GOH|GL|Nuuk Airport
+GOT|SE|Gothenburg Airport
+GRO|ES|Girona Airport
+GRQ|NL|Groningen Airport
+GRU|BR|São Paulo Guarulhos Airport
+GRX|ES|Granada Airport
+GRZ|AT|Graz Airport
+GVA|CH|Geneva Airport
+HAA|NO|Hasvik Airport
+HAD|SE|Halmstad Airport
+HAJ|DE|Hannover Airport
+HAM|DE|Hamburg Airport
+HAN|VN|Hanoi Airport
+HAU|NO|Haugesund Airport
+HAV|CU|Havana Airport
+HEL|FI|Helsinki Airport
+HER|GR|Heraklion Airport
+HFT|NO|Hammerfest Airport
+HHN|DE|Frankfurt-Hahn Airport
+HKG|HK|Hong Kong Airport
+HKT|TH|Phuket Airport
+HND|JP|Tokyo Haneda Airport
+HOV|NO|Ørsta-Volda Airport
+HRG|EG|Hurghada Airport
+HUY|GB|Humberside Airport
+HVG|NO|Honningsvåg Airport
+IAD|US|Washington Dulles Airport
+IAH|US|Houston Airport
+IAS|RO|Iasi Airport
+IBZ|ES|Ibiza Airport
+ICN|KR|Seoul Incheon Airport
+INN|AT|Innsbruck Airport
+INV|GB|Inverness Airport
+IOM|IM|Isle of Man Airport
+ISB|PK|Islamabad Airport
+IST|TR|Istanbul Airport
+IVL|FI|Ivalo Airport
+JED|SA|Jeddah Airport
+JER|JE|Jersey Airport
+JFK|US|New York JFK Airport
+JKG|SE|Jönköping Airport
+JMK|GR|Mykonos Airport
+JNB|ZA|Johannesburg Airport
+JOE|FI|Joensuu Airport
+JSI|GR|Skiathos Airport
+JTR|GR|Santorini Airport
+KBP|UA|Kyiv Boryspil Airport
+KBV|TH|Krabi Airport
+KEF|IS|Reykjavik Keflavik Airport
+KGS|GR|Kos Airport
+KIV|MD|Chisinau Airport
+KIX|JP|Osaka Kansai Airport
+KKN|NO|Kirkenes Airport
+KLR|SE|Kalmar Airport
+KLU|AT|Klagenfurt Airport
+KLX|GR|Kalamata Airport
+KOI|GB|Kirkwall Airport
+KRK|PL|Krakow Airport
+KRN|SE|Kiruna Airport
+KRP|DK|Karup Airport
+KRS|NO|Kristiansand Airport
+KSC|SK|Kosice Airport
+KSD|SE|Karlstad Airport
+KSU|NO|Kristiansund Airport
+KTM|NP|Kathmandu Airport
+KTT|FI|Kittilä Airport
+KTW|PL|Katowice Airport
+KUL|MY|Kuala Lumpur Airport
+KUN|LT|Kaunas Airport
+KUO|FI|Kuopio Airport
+KVA|GR|Kavala Airport
+KWI|KW|Kuwait Airport
+LAS|US|Las Vegas Airport
+LAX|US|Los Angeles Airport
+LBA|GB|Leeds Bradford Airport
+LCA|CY|Larnaca Airport
+LCG|ES|A Coruña Airport
+LCJ|PL|Lodz Airport
+LCY|GB|London City Airport
+LED|RU|Saint Petersburg Pulkovo Airport
+LEI|ES|Almería Airport
+LEJ|DE|Leipzig/Halle Airport
+LGA|US|New York LaGuardia Airport
+LGG|BE|Liège Airport
+LGW|GB|London Gatwick Airport
+LHR|GB|London Heathrow Airport
+LIL|FR|Lille Airport
+LIM|PE|Lima Airport
+LIN|IT|Milan Linate Airport
+LIS|PT|Lisbon Airport
+LJU|SI|Ljubljana Airport
+LKL|NO|Lakselv Airport
+LKN|NO|Leknes Airport
+LLA|SE|Luleå Airport
+LNZ|AT|Linz Airport
+LOS|NG|Lagos Airport
+LPA|ES|Gran Canaria Airport
+LPL|GB|Liverpool Airport
+LSI|GB|Sumburgh Airport
+LTN|GB|London Luton Airport
+LUX|LU|Luxembourg Airport
+LUZ|PL|Lublin Airport
+LYR|NO|Svalbard Longyear Airport
+LYS|FR|Lyon Airport
+MAD|ES|Madrid Barajas Airport
+MAH|ES|Menorca Airport
+MAN|GB|Manchester Airport
+MCO|US|Orlando Airport
+MCT|OM|Muscat Airport
+MEH|NO|Mehamn Airport
+MEL|AU|Melbourne Airport
+MEX|MX|Mexico City Airport
+MIA|US|Miami Airport
+MJF|NO|Mosjøen Airport
+MJT|GR|Mytilene Airport
+MLA|MT|Malta Airport
+MLE|MV|Malé Airport
+MMK|RU|Murmansk Airport
+MMX|SE|Malmö Airport
+MNL|PH|Manila Airport
+MOL|NO|Molde Airport
+MPL|FR|Montpellier Airport
+MQN|NO|Mo i Rana Airport
+MRS|FR|Marseille Airport
+MSP|US|Minneapolis Airport
+MST|NL|Maastricht Aachen Airport
+MUC|DE|Munich Airport
+MXP|IT|Milan Malpensa Airport
+NAP|IT|Naples Airport
+NBE|TN|Enfidha Airport
+NBO|KE|Nairobi Airport
+NCE|FR|Nice Côte d'Azur Airport
+NCL|GB|Newcastle Airport
+NRK|SE|Norrköping Airport
+NRN|DE|Weeze Airport
+NRT|JP|Tokyo Narita Airport
+NTB|NO|Notodden Airport
+NTE|FR|Nantes Airport
+NUE|DE|Nuremberg Airport
+NWI|GB|Norwich Airport
+NYO|SE|Stockholm Skavsta Airport
+OHD|MK|Ohrid Airport
+OLA|NO|Ørland Airport
+OLB|IT|Olbia Airport
+OPO|PT|Porto Airport
+ORB|SE|Örebro Airport
+ORD|US|Chicago O'Hare Airport
+ORK|IE|Cork Airport
+ORY|FR|Paris Orly Airport
+OSD|SE|Åre Östersund Airport
+OSL|NO|Oslo Airport
+OSY|NO|Namsos Airport
+OTP|RO|Bucharest Otopeni Airport
+OUL|FI|Oulu Airport
+OVD|ES|Asturias Airport
+PAD|DE|Paderborn Lippstadt Airport
+PDL|PT|Ponta Delgada Airport
+PEK|CN|Beijing Capital Airport
+PER|AU|Perth Airport
+PFO|CY|Paphos Airport
+PGF|FR|Perpignan Airport
+PHL|US|Philadelphia Airport
+PIK|GB|Glasgow Prestwick Airport
+PKX|CN|Beijing Daxing Airport
+PLQ|LT|Palanga Airport
+PMI|ES|Palma de Mallorca Airport
+PMO|IT|Palermo Airport
+POZ|PL|Poznan Airport
+PRG|CZ|Prague Airport
+PRN|XK|Pristina Airport
+PSA|IT|Pisa Airport
+PSR|IT|Pescara Airport
+PUF|FR|Pau Airport
+PUJ|DO|Punta Cana Airport
+PUY|HR|Pula Airport
+PVG|CN|Shanghai Pudong Airport
+PVK|GR|Preveza Airport
+PXO|PT|Porto Santo Airport
+RAK|MA|Marrakesh Airport
+RET|NO|Røst Airport
+REU|ES|Reus Airport
+RHO|GR|Rhodes Airport
+RIX|LV|Riga Airport
+RJK|HR|Rijeka Airport
+RKV|IS|Reykjavik Airport
+RMI|IT|Rimini Airport
+RMU|ES|Murcia Airport
+RNB|SE|Ronneby Airport
+RNN|DK|Bornholm Airport
+RNS|FR|Rennes Airport
+RRS|NO|Røros Airport
+RTM|NL|Rotterdam The Hague Airport
+RUH|SA|Riyadh Airport
+RVK|NO|Rørvik Airport
+RVN|FI|Rovaniemi Airport
+RYG|NO|Moss Airport Rygge
+RZE|PL|Rzeszow Airport
+SAW|TR|Istanbul Sabiha Gökçen Airport
+SCL|CL|Santiago Airport
+SCQ|ES|Santiago de Compostela Airport
+SDL|SE|Sundsvall Airport
+SDN|NO|Sandane Airport
+SDR|ES|Santander Airport
+SEA|US|Seattle-Tacoma Airport
+SEN|GB|London Southend Airport
+SFJ|GL|Kangerlussuaq Airport
+SFO|US|San Francisco Airport
+SFT|SE|Skellefteå Airport
+SGD|DK|Sønderborg Airport
+SGN|VN|Ho Chi Minh City Airport
+SID|CV|Sal Airport
+SIN|SG|Singapore Changi Airport
+SJJ|BA|Sarajevo Airport
+SKE|NO|Skien Airport
+SKG|GR|Thessaloniki Airport
+SKN|NO|Stokmarknes Airport
+SKP|MK|Skopje Airport
+SMI|GR|Samos Airport
+SNN|IE|Shannon Airport
+SOF|BG|Sofia Airport
+SOG|NO|Sogndal Airport
+SOJ|NO|Sørkjosen Airport
+SOU|GB|Southampton Airport
+SPC|ES|La Palma Airport
+SPU|HR|Split Airport
+SRP|NO|Stord Airport
+SSH|EG|Sharm El Sheikh Airport
+SSJ|NO|Sandnessjøen Airport
+STN|GB|London Stansted Airport
+STR|DE|Stuttgart Airport
+SUF|IT|Lamezia Terme Airport
+SVG|NO|Stavanger Airport
+SVJ|NO|Svolvær Airport
+SVO|RU|Moscow Sheremetyevo Airport
+SVQ|ES|Seville Airport
+SXB|FR|Strasbourg Airport
+SYD|AU|Sydney Airport
+SZG|AT|Salzburg Airport
+SZZ|PL|Szczecin Airport
+TAY|EE|Tartu Airport
+TBS|GE|Tbilisi Airport
+TER|PT|Lajes Airport
+TFN|ES|Tenerife North Airport
+TFS|ES|Tenerife South Airport
+TGD|ME|Podgorica Airport
+TIA|AL|Tirana Airport
+TIV|ME|Tivat Airport
+TKU|FI|Turku Airport
+TLL|EE|Tallinn Airport
+TLN|FR|Toulon Airport
+TLS|FR|Toulouse Airport
+TLV|IL|Tel Aviv Ben Gurion Airport
+TMP|FI|Tampere Airport
+TOS|NO|Tromsø Airport
+TPE|TW|Taipei Taoyuan Airport
+TPS|IT|Trapani Airport
+TRD|NO|Trondheim Airport
+TRF|NO|Sandefjord Airport Torp
+TRN|IT|Turin Airport
+TRS|IT|Trieste Airport
+TSF|IT|Treviso Airport
+TSR|RO|Timisoara Airport
+TUN|TN|Tunis Carthage Airport
+UME|SE|Umeå Airport
+VAA|FI|Vaasa Airport
+VAR|BG|Varna Airport
+VAW|NO|Vardø Airport
+VBY|SE|Visby Airport
+VCE|IT|Venice Airport
+VDS|NO|Vadsø Airport
+VGO|ES|Vigo Airport
+VIE|AT|Vienna Airport
+VLC|ES|Valencia Airport
+VNO|LT|Vilnius Airport
+VOL|GR|Volos Airport
+VRN|IT|Verona Airport
+VST|SE|Stockholm Västerås Airport
+VXO|SE|Växjö Airport
+WAW|PL|Warsaw Chopin Airport
+WMI|PL|Warsaw Modlin Airport
+WRO|PL|Wroclaw Airport
+XRY|ES|Jerez Airport
+YUL|CA|Montreal Airport
+YVR|CA|Vancouver Airport
+YYC|CA|Calgary Airport
+YYZ|CA|Toronto Pearson Airport
+ZAD|HR|Zadar Airport
+ZAG|HR|Zagreb Airport
+ZAZ|ES|Zaragoza Airport
+ZRH|CH|Zurich Airport
+ZTH|GR|Zakynthos Airport
+"""
+
+_INDEX: Optional[Dict[str, Tuple[str, str]]] = None
+
+
+def _index() -> Dict[str, Tuple[str, str]]:
+    global _INDEX
+    if _INDEX is None:
+        index: Dict[str, Tuple[str, str]] = {}
+        for line in _AIRPORTS.splitlines():
+            code, country, name = line.split("|", 2)
+            index[code] = (country, name)
+        _INDEX = index
+    return _INDEX
+
+
+def lookup_airport(iata_code: str) -> Optional[Dict[str, str]]:
+    """Return Airlabs-shaped metadata for a bundled airport, or None if unknown."""
+    code = (iata_code or "").strip().upper()
+    entry = _index().get(code)
+    if entry is None:
+        return None
+    return {"iata_code": code, "country_code": entry[0], "name": entry[1]}
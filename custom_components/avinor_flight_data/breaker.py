@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+"""Per-host circuit breakers shared by every API client of the integration."""
+
+import asyncio
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+import logging
+import random
+import time
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import (
+    BREAKER_BASE_BACKOFF_SECONDS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_JITTER_RATIO,
+    BREAKER_MAX_BACKOFF_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to a host that is known to be down."""
+
+
+def is_outage(err: BaseException) -> bool:
+    """Return True for errors that say the host is unavailable (not a bad request)."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500 or err.status == 429
+    return isinstance(err, (asyncio.TimeoutError, aiohttp.ClientConnectionError))
+
+
+class CircuitBreaker:
+    """Circuit breaker for one host.
+
+    After `failure_threshold` consecutive outages the circuit opens and
+    requests fail fast with `CircuitOpenError`. Once the backoff has passed
+    a single probe request is let through (half open): success closes the
+    circuit, failure reopens it with twice the backoff, plus jitter, capped
+    at `max_backoff`.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = BREAKER_BASE_BACKOFF_SECONDS,
+        max_backoff: float = BREAKER_MAX_BACKOFF_SECONDS,
+    ) -> None:
+        self.host = host
+        self._failure_threshold = max(int(failure_threshold), 1)
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        return max(self._retry_at - time.monotonic(), 0.0)
+
+    def _before_call(self) -> bool:
+        """Return True when this call is the half-open probe."""
+        if self.state == STATE_CLOSED:
+            return False
+        if self.state == STATE_OPEN and time.monotonic() >= self._retry_at:
+            self.state = STATE_HALF_OPEN
+        if self.state == STATE_HALF_OPEN and not self._probing:
+            self._probing = True
+            _LOGGER.debug("Circuit for %s half open, sending probe", self.host)
+            return True
+        raise CircuitOpenError(f"{self.host} is unavailable, retrying in {self.retry_in:.0f}s")
+
+    def record_success(self) -> None:
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s is reachable again", self.host)
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._trips = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == STATE_HALF_OPEN or self._failures >= self._failure_threshold:
+            backoff = min(self._base_backoff * 2**self._trips, self._max_backoff)
+            backoff *= random.uniform(1 - BREAKER_JITTER_RATIO, 1 + BREAKER_JITTER_RATIO)
+            self._trips += 1
+            self._retry_at = time.monotonic() + backoff
+            if self.state == STATE_CLOSED:
+                _LOGGER.warning("%s looks down; pausing requests for %.0fs", self.host, backoff)
+            else:
+                _LOGGER.debug("%s still down; next probe in %.0fs", self.host, backoff)
+            self.state = STATE_OPEN
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Wrap one request: fail fast while open, record the outcome otherwise."""
+        probe = self._before_call()
+        try:
+            yield
+        except Exception as err:
+            if is_outage(err):
+                self.record_failure()
+            else:
+                # The host answered; the request itself was the problem.
+                self.record_success()
+            raise
+        else:
+            self.record_success()
+        finally:
+            if probe:
+                self._probing = False
+                if self.state == STATE_HALF_OPEN:
+                    # Probe was cancelled before it finished; let the next call probe.
+                    self.state = STATE_OPEN
+
+
+class CircuitBreakerRegistry:
+    """Domain-wide `CircuitBreaker` per host."""
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).hostname or url
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def get(self, host: str) -> Optional[CircuitBreaker]:
+        return self._breakers.get(host)
+
+
+def guard(breakers: Optional[CircuitBreakerRegistry], url: str) -> AbstractContextManager:
+    """Return the breaker guard for `url`, or a no-op without a registry."""
+    if breakers is None:
+        return nullcontext()
+    return breakers.for_url(url).guard()
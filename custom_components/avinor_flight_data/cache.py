@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+"""Caches shared by every entry of the integration."""
+
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from .const import (
+    AIRPORT_CACHE_MAX_ENTRIES,
+    AIRPORT_CACHE_SAVE_DELAY,
+    AIRPORT_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTLS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Never part of a cache key: responses do not depend on it and it must not be kept around.
+_SECRET_PARAMS = frozenset({"api_key"})
+
+
+class AirportMetadataCache:
+    """Airlabs airport metadata keyed by IATA code.
+
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted beyond `max_entries`. When a Home Assistant `Store` is given the
+    cache is loaded from and (debounced) saved to disk, so it survives
+    restarts and reloads.
+    """
+
+    def __init__(
+        self,
+        *,
+        store: Any = None,
+        ttl: float = AIRPORT_CACHE_TTL_SECONDS,
+        max_entries: int = AIRPORT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._store = store
+        self._ttl = ttl
+        self._max_entries = max(int(max_entries), 1)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._load_task: Optional[asyncio.Future] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, code: object) -> bool:
+        return self.get(str(code)) is not None
+
+    async def async_load(self) -> None:
+        """Load persisted entries once; later calls wait for the same load."""
+        if self._store is None:
+            return
+        if self._load_task is None:
+            self._load_task = asyncio.ensure_future(self._async_load())
+        await asyncio.shield(self._load_task)
+
+    async def _async_load(self) -> None:
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Failed loading airport metadata cache: %s", err)
+            return
+        airports = (stored or {}).get("airports", {})
+        now = time.time()
+        # Oldest first so the LRU order survives the round trip.
+        for code, item in sorted(airports.items(), key=lambda kv: kv[1].get("ts", 0)):
+            ts = float(item.get("ts", 0))
+            # Empty results (failed lookups from older versions) are looked up again.
+            if now - ts < self._ttl and code not in self._entries and item.get("data"):
+                self._entries[code] = (ts, item["data"])
+        self._evict()
+        _LOGGER.debug("Loaded %d cached airports", len(self._entries))
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(code)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= self._ttl:
+            del self._entries[code]
+            return None
+        self._entries.move_to_end(code)
+        return entry[1]
+
+    def __getitem__(self, code: str) -> Dict[str, Any]:
+        value = self.get(code)
+        if value is None:
+            raise KeyError(code)
+        return value
+
+    def __setitem__(self, code: str, data: Dict[str, Any]) -> None:
+        if not data:
+            # Nothing learned; don't pin a blank classification for the whole TTL.
+            return
+        self._entries[code] = (time.time(), data)
+        self._entries.move_to_end(code)
+        self._evict()
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, AIRPORT_CACHE_SAVE_DELAY)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {"airports": {code: {"ts": ts, "data": data} for code, (ts, data) in self._entries.items()}}
+
+
+class ResponseCache:
+    """Parsed API responses shared by every client of the integration.
+
+    Keyed by response kind, endpoint URL and normalized params (sorted,
+    without the API key). Each endpoint has its own TTL (`ttls`, matched on
+    the URL path; endpoints without one are not cached), and beyond
+    `max_entries` the least recently used responses are evicted. `hits`,
+    `misses` and `evictions` count cache use.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttls: Mapping[str, float] = RESPONSE_CACHE_TTLS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._ttls = dict(ttls)
+        self._max_entries = max(int(max_entries), 1)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    @staticmethod
+    def key(kind: str, url: str, params: Optional[Mapping[str, Any]] = None) -> Tuple:
+        normalized = tuple(
+            sorted((str(name), str(value)) for name, value in (params or {}).items() if name not in _SECRET_PARAMS)
+        )
+        return (kind, url.rstrip("/"), normalized)
+
+    def ttl_for(self, url: str) -> float:
+        path = urlsplit(url).path.rstrip("/")
+        for endpoint, ttl in self._ttls.items():
+            if path.endswith(endpoint.rstrip("/")):
+                return ttl
+        return 0.0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, *, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def cached(
+    cache: Optional[ResponseCache],
+    kind: str,
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    fetch: Callable[[], Awaitable[_T]],
+    *,
+    cacheable: Optional[Callable[[_T], bool]] = None,
+) -> _T:
+    """Return a cached response, or `fetch` it and cache it when allowed.
+
+    `None` results are never cached, nor those `cacheable` rejects.
+    """
+    if cache is None:
+        return await fetch()
+    ttl = cache.ttl_for(url)
+    key = cache.key(kind, url, params)
+    if ttl > 0:
+        value = cache.get(key)
+        if value is not None:
+            return value
+    value = await fetch()
+    if value is not None and (cacheable is None or cacheable(value)):
+        cache.set(key, value, ttl=ttl)
+    return value
@@ -19,16 +19,31 @@ from .const import (
     CONF_TIME_TO,
     CONF_FLIGHT_TYPE,
     CONF_AIRLABS_API_KEY,
+    CONF_AIRLABS_MONTHLY_QUOTA,
     CONF_SCHEDULE_SOURCE,
+    CONF_ATTRIBUTE_PROFILE,
+    ATTRIBUTE_PROFILE_FULL,
+    ATTRIBUTE_PROFILE_FULL_UNRECORDED,
+    ATTRIBUTE_PROFILE_CAPPED,
+    ATTRIBUTE_PROFILE_SUMMARY,
     DEFAULT_TIME_FROM,
     DEFAULT_TIME_TO,
     DEFAULT_FLIGHT_TYPE,
     DEFAULT_SCHEDULE_SOURCE,
+    DEFAULT_ATTRIBUTE_PROFILE,
+    DEFAULT_AIRLABS_MONTHLY_QUOTA,
 )
 from .api import AvinorApiClient
 
 _LOGGER = logging.getLogger(__name__)
 
+ATTRIBUTE_PROFILE_CHOICES = {
+    ATTRIBUTE_PROFILE_FULL: "Full flight list",
+    ATTRIBUTE_PROFILE_FULL_UNRECORDED: "Full flight list, not recorded in history",
+    ATTRIBUTE_PROFILE_CAPPED: "Capped flight list",
+    ATTRIBUTE_PROFILE_SUMMARY: "Summary only",
+}
+
 # Attempt to import selector helpers (available in modern Home Assistant). Fallback if missing.
 SELECTORS_AVAILABLE = False
 try:
@@ -105,6 +120,10 @@ class AvinorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "airlabs": "Airlabs schedules",
                 }),
                 vol.Optional(CONF_AIRLABS_API_KEY): vol.All(str, vol.Length(min=1)),
+                vol.Optional(CONF_AIRLABS_MONTHLY_QUOTA, default=DEFAULT_AIRLABS_MONTHLY_QUOTA): vol.All(
+                    int, vol.Range(min=1)
+                ),
+                vol.Optional(CONF_ATTRIBUTE_PROFILE, default=DEFAULT_ATTRIBUTE_PROFILE): vol.In(ATTRIBUTE_PROFILE_CHOICES),
             }
         )
 
@@ -143,6 +162,8 @@ class AvinorOptionsFlow(config_entries.OptionsFlow):
         flight_type_default = current.get(CONF_FLIGHT_TYPE, DEFAULT_FLIGHT_TYPE)
         schedule_source_default = current.get(CONF_SCHEDULE_SOURCE, DEFAULT_SCHEDULE_SOURCE)
         airlabs_key_default = current.get(CONF_AIRLABS_API_KEY)
+        attribute_profile_default = current.get(CONF_ATTRIBUTE_PROFILE, DEFAULT_ATTRIBUTE_PROFILE)
+        airlabs_quota_default = current.get(CONF_AIRLABS_MONTHLY_QUOTA, DEFAULT_AIRLABS_MONTHLY_QUOTA)
 
         # Build airport field - use simple vol.In for reliability
         if airports:
@@ -175,6 +196,10 @@ class AvinorOptionsFlow(config_entries.OptionsFlow):
                     "airlabs": "Airlabs schedules",
                 }),
                 vol.Optional(CONF_AIRLABS_API_KEY, default=airlabs_key_default): vol.Any(None, vol.All(str, vol.Length(min=1))),
+                vol.Optional(CONF_AIRLABS_MONTHLY_QUOTA, default=airlabs_quota_default): vol.All(
+                    int, vol.Range(min=1)
+                ),
+                vol.Optional(CONF_ATTRIBUTE_PROFILE, default=attribute_profile_default): vol.In(ATTRIBUTE_PROFILE_CHOICES),
             }
         )
         return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -194,8 +219,12 @@ async def _async_fetch_airports(hass: HomeAssistant) -> List[Dict[str, str]]:
             return airports
 
     # Fetch fresh data from Avinor API
-    session = async_get_clientsession(hass)
-    api = AvinorApiClient(session)
+    # Reuse the shared client while entries are loaded; a flow alone doesn't create one.
+    hub = domain_store.get("clients")
+    if hub is not None:
+        api = hub.avinor
+    else:
+        api = AvinorApiClient(async_get_clientsession(hass))
     try:
         _LOGGER.info("Fetching airport list from Avinor API...")
         airports = await api.async_get_airports()
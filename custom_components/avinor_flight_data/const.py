@@ -8,15 +8,32 @@ CONF_TIME_TO = "time_to"
 # Optional Airlabs integration (flight details)
 CONF_AIRLABS_API_KEY = "airlabs_api_key"
 CONF_SCHEDULE_SOURCE = "schedule_source"
+CONF_AIRLABS_MONTHLY_QUOTA = "airlabs_monthly_quota"
 
 # Client-side filtering options
 CONF_FLIGHT_TYPE = "flight_type"  # Avinor dom_int field
 
+# How much flight data the sensor puts in its state attributes
+CONF_ATTRIBUTE_PROFILE = "attribute_profile"
+ATTRIBUTE_PROFILE_FULL = "full"  # full `flights` list, recorded (legacy behaviour)
+ATTRIBUTE_PROFILE_FULL_UNRECORDED = "full_unrecorded"  # full list, excluded from the recorder
+ATTRIBUTE_PROFILE_CAPPED = "capped"  # `flights` limited to ATTRIBUTE_CAPPED_MAX_FLIGHTS
+ATTRIBUTE_PROFILE_SUMMARY = "summary"  # only `flights_summary`
+ATTRIBUTE_PROFILES = [
+    ATTRIBUTE_PROFILE_FULL,
+    ATTRIBUTE_PROFILE_FULL_UNRECORDED,
+    ATTRIBUTE_PROFILE_CAPPED,
+    ATTRIBUTE_PROFILE_SUMMARY,
+]
+ATTRIBUTE_CAPPED_MAX_FLIGHTS = 25
+
 DEFAULT_TIME_FROM = 1
 DEFAULT_TIME_TO = 7
 
 DEFAULT_FLIGHT_TYPE = ""  # empty = all
 DEFAULT_SCHEDULE_SOURCE = "avinor"
+DEFAULT_ATTRIBUTE_PROFILE = ATTRIBUTE_PROFILE_FULL
+DEFAULT_AIRLABS_MONTHLY_QUOTA = 1000  # Airlabs free plan
 
 PLATFORMS = ["sensor"]
 
@@ -32,5 +49,96 @@ AIRLABS_API_FLIGHT_DETAILS = "/flight"
 AIRLABS_API_SCHEDULES = "/schedules"
 AIRLABS_API_AIRPORTS = "/airports"
 
+# Max concurrent Airlabs /airports lookups per client
+AIRLABS_AIRPORT_LOOKUP_CONCURRENCY = 8
+
+# get_flight_details batches: max flights per call and concurrent /flight requests
+AIRLABS_FLIGHT_DETAILS_MAX_BATCH = 50
+AIRLABS_FLIGHT_DETAILS_CONCURRENCY = 4
+
+# Airlabs /schedules pagination: page size, hard cap on pages per update and
+# how many follow-up pages are requested concurrently
+AIRLABS_SCHEDULES_PAGE_SIZE = 50
+AIRLABS_SCHEDULES_MAX_PAGES = 10
+AIRLABS_SCHEDULES_PARALLEL_PAGES = 3
+
+# Airlabs request budget (token bucket per API key, shared by all entries).
+# The bucket holds AIRLABS_BURST_RATIO of the monthly quota and refills at the
+# monthly rate; background polls leave AIRLABS_BACKGROUND_RESERVE_RATIO of it
+# for service calls, which may wait up to AIRLABS_INTERACTIVE_MAX_WAIT seconds.
+AIRLABS_BURST_RATIO = 0.05
+AIRLABS_BACKGROUND_RESERVE_RATIO = 0.2
+AIRLABS_INTERACTIVE_MAX_WAIT = 10
+
+# Persistent Airlabs airport metadata cache (shared by all entries)
+AIRPORT_CACHE_STORAGE_KEY = f"{DOMAIN}.airport_cache"
+AIRPORT_CACHE_STORAGE_VERSION = 1
+AIRPORT_CACHE_TTL_SECONDS = 30 * 24 * 3600
+AIRPORT_CACHE_MAX_ENTRIES = 2000
+AIRPORT_CACHE_SAVE_DELAY = 30
+
+# Per-host circuit breaker: open after FAILURE_THRESHOLD consecutive outages
+# (timeouts, connection errors, 5xx/429), then probe after a backoff that
+# doubles per failed probe, +/- JITTER_RATIO, capped at MAX_BACKOFF.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_BACKOFF_SECONDS = 30
+BREAKER_MAX_BACKOFF_SECONDS = 900
+BREAKER_JITTER_RATIO = 0.2
+
+# Domain-wide response cache: TTL (seconds) per endpoint path, and the number
+# of responses kept before the least recently used ones are evicted. Feeds
+# that entries poll stay below the fastest poll interval, so a poll never
+# gets the response its own previous poll already saw.
+RESPONSE_CACHE_TTLS = {
+    API_FLIGHTS: 45,
+    API_AIRPORTS: 24 * 3600,
+    AIRLABS_API_SCHEDULES: 45,
+    AIRLABS_API_AIRPORTS: 24 * 3600,
+    AIRLABS_API_FLIGHT_DETAILS: 60,
+}
+RESPONSE_CACHE_MAX_ENTRIES = 128
+
+# How long the domain-wide clients and their caches are kept after the last
+# entry unloads (covers reloads)
+HUB_IDLE_CLOSE_SECONDS = 60
+
+# Persisted last-known-good coordinator data, restored at startup
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshots"
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60
+SNAPSHOT_MAX_AGE_SECONDS = 6 * 3600
+
+# Read size used when stream-parsing the XmlFeed body
+STREAM_CHUNK_SIZE = 64 * 1024
+
 # Update every 3 minutes as suggested by Avinor docs
 UPDATE_INTERVAL_SECONDS = 180
+
+# Adaptive polling (see scheduling.py): fast while flights are within
+# -AFTER/+BEFORE minutes of their schedule time or just changed status, quiet
+# with an empty window or at night (local hours START..END), and polls are
+# timed FEED_LAG seconds after the feed's next expected lastUpdate.
+ADAPTIVE_FAST_INTERVAL_SECONDS = 60
+ADAPTIVE_QUIET_INTERVAL_SECONDS = 600
+ADAPTIVE_IMMINENT_BEFORE_MINUTES = 30
+ADAPTIVE_IMMINENT_AFTER_MINUTES = 15
+ADAPTIVE_NIGHT_START_HOUR = 0
+ADAPTIVE_NIGHT_END_HOUR = 5
+ADAPTIVE_FEED_LAG_SECONDS = 10
+
+# Refresh staggering: groups (one per shared feed) are spread evenly across
+# the interval, shifted by up to GROUP_JITTER_RATIO of their slot; entries in
+# a group add up to ENTRY_JITTER seconds (well below FEED_MAX_AGE_SECONDS).
+# Once a feed's publish cadence is known, polls keep its timing and are only
+# spread over CADENCE_JITTER seconds (at most a quarter of the cadence).
+STAGGER_GROUP_JITTER_RATIO = 0.2
+STAGGER_ENTRY_JITTER_SECONDS = 5
+STAGGER_CADENCE_JITTER_SECONDS = 15
+
+# Used for night hours when Home Assistant has no time zone configured
+DEFAULT_TIME_ZONE = "Europe/Oslo"
+
+# Entries for the same airport share one feed download; a fetch younger than
+# this is reused instead of requesting the XmlFeed again. Kept below the fast
+# polling interval so fast polls still see new data.
+FEED_MAX_AGE_SECONDS = 50
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from datetime import timedelta, tzinfo
 import logging
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .api import AirlabsApiClient, AvinorApiClient
+from .api import AvinorApiClient
+from .breaker import CircuitOpenError
+from .feed import AvinorAirportFeed, slice_flights
+from .models import FlightDelta, build_flight_index, diff_flights
+from .quota import AirlabsQuotaScheduler
+from .scheduling import FeedCadence, StaggerSlot, traffic_interval
+from .snapshot import EntrySnapshot
 from .const import (
     CONF_AIRPORT,
     CONF_AIRLABS_API_KEY,
@@ -15,40 +23,200 @@ from .const import (
     CONF_SCHEDULE_SOURCE,
     CONF_TIME_FROM,
     CONF_TIME_TO,
+    DEFAULT_TIME_ZONE,
+    STAGGER_CADENCE_JITTER_SECONDS,
 )
 
+if TYPE_CHECKING:
+    from .airlabs import AirlabsApiClient
+
 _LOGGER = logging.getLogger(__name__)
 
+_NO_CHANGES = FlightDelta((), (), {})
+
+
+def _local_timezone(hass: HomeAssistant | None) -> tzinfo | None:
+    name = getattr(getattr(hass, "config", None), "time_zone", None)
+    try:
+        return ZoneInfo(name or DEFAULT_TIME_ZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
 
 class AvinorCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    """Coordinator to manage fetching Avinor flight data."""
+    """Coordinator to manage fetching Avinor flight data.
+
+    Published data holds `lastUpdate`, `flights`, `delta` (the `FlightDelta`
+    against the previous poll, keyed by `uniqueId`, so listeners can tell
+    whether their part of the data changed) and `index` (flights bucketed by
+    `dom_int`, `arr_dep` and airline, see `build_flight_index`).
+
+    `update_interval` adapts after every poll: faster while flights are
+    close to their schedule time, slower at night or with an empty window,
+    and timed to land just after the feed's next expected `lastUpdate` (see
+    `scheduling`). Airlabs entries given a `budget` stretch it further when
+    the shared request budget for their API key runs low, and a `stagger`
+    slot keeps entries from refreshing at the same moment.
+
+    With a `snapshot`, every new dataset is persisted (debounced) and
+    `restore_snapshot` can publish it at startup before the first fetch.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api: AvinorApiClient,
-        airlabs_api: AirlabsApiClient,
+        airlabs_api: AirlabsApiClient | None,
         conf: Dict[str, Any],
         *,
         update_interval: timedelta,
+        feed: Optional[AvinorAirportFeed] = None,
+        budget: Optional[AirlabsQuotaScheduler] = None,
+        stagger: Optional[StaggerSlot] = None,
+        snapshot: Optional[EntrySnapshot] = None,
     ) -> None:
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="Avinor Flight Data",
-            update_interval=update_interval,
-        )
+        try:
+            # Only notify listeners when the data actually changed (HA 2023.9+).
+            super().__init__(
+                hass,
+                _LOGGER,
+                name="Avinor Flight Data",
+                update_interval=update_interval,
+                always_update=False,
+            )
+        except TypeError:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name="Avinor Flight Data",
+                update_interval=update_interval,
+            )
         self._api = api
         self._airlabs_api = airlabs_api
         self._conf = conf
+        self._feed = feed
+        self._budget = budget
+        self._stagger = stagger
+        self._snapshot = snapshot
+        self._base_update_interval = update_interval
+        self._airlabs_requests_per_poll: Optional[float] = None
+        self._cadence = FeedCadence()
+        self._tz = _local_timezone(hass)
         self._last_data: Optional[Dict[str, Any]] = None
+        self._update_failed = False
+        self.delta: Optional[FlightDelta] = None
+
+    async def _async_fetch_airlabs(self) -> Dict[str, Any]:
+        api_key = self._conf.get(CONF_AIRLABS_API_KEY, "")
+        bucket = self._budget.bucket(api_key) if self._budget is not None and api_key else None
+        consumed = bucket.consumed if bucket is not None else 0
+        try:
+            return await self._airlabs_api.async_get_schedules(
+                api_key=api_key,
+                airport=self._conf[CONF_AIRPORT],
+                direction=self._conf.get(CONF_DIRECTION),
+                time_from=self._conf.get(CONF_TIME_FROM),
+                time_to=self._conf.get(CONF_TIME_TO),
+            )
+        finally:
+            spent = bucket.consumed - consumed if bucket is not None else 0
+            if spent > 0:
+                previous = self._airlabs_requests_per_poll
+                self._airlabs_requests_per_poll = spent if previous is None else 0.7 * previous + 0.3 * spent
+
+    def _schedule_next_poll(self, data: Dict[str, Any]) -> None:
+        """Adapt `update_interval` to traffic, feed cadence and Airlabs budget."""
+        if self._base_update_interval is None:
+            return
+        if self._update_failed:
+            # Cached or placeholder data says nothing about current traffic;
+            # retry at the normal pace instead of the quiet one.
+            interval = self._base_update_interval
+        else:
+            interval = traffic_interval(
+                data.get("flights", []),
+                base=self._base_update_interval,
+                delta=self.delta,
+                tz=self._tz,
+            )
+        api_key = self._conf.get(CONF_AIRLABS_API_KEY, "")
+        if self._conf.get(CONF_SCHEDULE_SOURCE) == "airlabs":
+            # Airlabs has no publish cadence; `lastUpdate` is our own fetch time.
+            if self._budget is not None and api_key:
+                interval = self._budget.poll_interval(
+                    api_key,
+                    interval,
+                    requests_per_poll=self._airlabs_requests_per_poll or 1.0,
+                )
+        period = None
+        if self._conf.get(CONF_SCHEDULE_SOURCE) != "airlabs" and not self._update_failed:
+            self._cadence.observe(data.get("lastUpdate"))
+            period = self._cadence.period
+            interval = self._cadence.align(interval)
+        if self._stagger is not None:
+            if period:
+                # Keep the poll just after the next publish; only spread it a little.
+                limit = min(STAGGER_CADENCE_JITTER_SECONDS, period / 4)
+                interval += self._stagger.jitter(timedelta(seconds=limit))
+            else:
+                interval = self._stagger.align(interval)
+        if interval != self.update_interval:
+            _LOGGER.debug("Polling %s every %s", self._conf.get(CONF_AIRPORT), interval)
+            self.update_interval = interval
+
+    def _publishable(self, flights: Dict[str, Any], delta: FlightDelta) -> Dict[str, Any]:
+        return {
+            **flights,
+            "delta": delta,
+            "index": build_flight_index(flights.get("flights", [])),
+        }
+
+    def restore_snapshot(self) -> bool:
+        """Publish the persisted last-known-good dataset; False when there is none."""
+        if self._snapshot is None or self._last_data is not None:
+            return False
+        flights = self._snapshot.load()
+        if flights is None:
+            return False
+        self._last_data = self._publishable(flights, _NO_CHANGES)
+        self.data = self._last_data
+        _LOGGER.debug(
+            "Restored %d flights for %s from snapshot (lastUpdate=%s)",
+            len(flights["flights"]),
+            self._conf.get(CONF_AIRPORT),
+            flights.get("lastUpdate"),
+        )
+        return True
+
+    async def async_first_refresh(self, *, restored: bool) -> None:
+        """First refresh after setup.
+
+        With restored snapshot data it starts at this entry's stagger slot
+        within the regular interval; without, right away so entities don't
+        stay empty.
+        """
+        if restored and self._stagger is not None and self._base_update_interval is not None:
+            delay = self._stagger.first_delay(self._base_update_interval)
+            if delay > timedelta(0):
+                await asyncio.sleep(delay.total_seconds())
+        await self.async_refresh()
 
     async def _async_update_data(self) -> Dict[str, Any]:
+        data = await self._async_fetch_data()
+        self._schedule_next_poll(data)
+        return data
+
+    async def _async_fetch_data(self) -> Dict[str, Any]:
+        self.delta = _NO_CHANGES
+        self._update_failed = False
         try:
             if self._conf.get(CONF_SCHEDULE_SOURCE) == "airlabs":
-                flights = await self._airlabs_api.async_get_schedules(
-                    api_key=self._conf.get(CONF_AIRLABS_API_KEY, ""),
-                    airport=self._conf[CONF_AIRPORT],
+                flights = await self._async_fetch_airlabs()
+            elif self._feed is not None:
+                # Shared per-airport download; keep only this entry's slice. Sliced
+                # again even when the feed is unchanged, as the window moves on.
+                flights = slice_flights(
+                    await self._feed.async_get(),
                     direction=self._conf.get(CONF_DIRECTION),
                     time_from=self._conf.get(CONF_TIME_FROM),
                     time_to=self._conf.get(CONF_TIME_TO),
@@ -59,15 +227,29 @@ class AvinorCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
                     direction=self._conf.get(CONF_DIRECTION),
                     time_from=self._conf.get(CONF_TIME_FROM),
                     time_to=self._conf.get(CONF_TIME_TO),
+                    known_last_update=(self._last_data or {}).get("lastUpdate"),
                 )
+                if flights is None and self._last_data is not None:
+                    return self._last_data
+
+            previous = self._last_data
+            delta = diff_flights(previous.get("flights") if previous else None, flights.get("flights", []))
+            self.delta = delta
+            if previous is not None and not delta and previous.get("lastUpdate") == flights.get("lastUpdate"):
+                return previous
 
             # Keep a copy as last known good data
-            self._last_data = flights
-            return flights
+            self._last_data = self._publishable(flights, delta)
+            if self._snapshot is not None:
+                self._snapshot.save(flights)
+            return self._last_data
         except Exception as err:  # noqa: BLE001
+            self._update_failed = True
             # Graceful fallback: if we have previous data, keep entity available with stale data.
             if self._last_data is not None:
-                _LOGGER.warning("Avinor update failed, serving cached data: %s", err)
+                # The breaker already logged the outage; don't repeat it every poll.
+                log = _LOGGER.debug if isinstance(err, CircuitOpenError) else _LOGGER.warning
+                log("Avinor update failed, serving cached data: %s", err)
                 return self._last_data
             # First update and no cache: return an empty dataset instead of making entity unavailable
             _LOGGER.error("Avinor initial update failed, returning empty dataset: %s", err)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+"""Shared per-airport Avinor feed.
+
+Config entries for the same airport only differ by direction, flight type or
+time window, so they read their own slice of one shared XmlFeed download
+instead of fetching it themselves.
+"""
+
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .api import AvinorApiClient
+from .const import DEFAULT_TIME_FROM, DEFAULT_TIME_TO, FEED_MAX_AGE_SECONDS
+from .singleflight import SingleFlight
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_schedule_time(value: Any) -> datetime | None:
+    """Parse an Avinor `schedule_time` (ISO 8601, usually with a `Z` suffix)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+# (TimeFrom, TimeTo) in hours. None leaves the parameter out, so Avinor
+# applies its own default, which DEFAULT_TIME_FROM/DEFAULT_TIME_TO match.
+_Window = Tuple[Optional[int], Optional[int]]
+
+
+def _window(time_from: Optional[int], time_to: Optional[int]) -> _Window:
+    return (
+        None if time_from is None else max(int(time_from), 0),
+        None if time_to is None else max(int(time_to), 0),
+    )
+
+
+def _effective_window(window: _Window) -> Tuple[int, int]:
+    """The hours Avinor actually serves for `window` (its defaults fill gaps)."""
+    return (
+        DEFAULT_TIME_FROM if window[0] is None else window[0],
+        DEFAULT_TIME_TO if window[1] is None else window[1],
+    )
+
+
+def slice_flights(
+    data: Dict[str, Any],
+    *,
+    direction: Optional[str],
+    time_from: Optional[int],
+    time_to: Optional[int],
+    now: datetime | None = None,
+) -> Dict[str, Any]:
+    """Return the part of a shared airport dataset that one entry asked for.
+
+    Mirrors the server-side `direction`, `TimeFrom` and `TimeTo` filters,
+    including their defaults when a window is not set. Flights without a
+    parseable `schedule_time` are kept.
+    """
+    now = now or datetime.now(timezone.utc)
+    direction = (direction or "").strip().upper()
+    hours_before, hours_after = _effective_window(_window(time_from, time_to))
+    window_start = now - timedelta(hours=hours_before)
+    window_end = now + timedelta(hours=hours_after)
+
+    flights: List[Any] = []
+    for flight in data.get("flights", []):
+        if direction and str(flight.get("arr_dep") or "").strip().upper() != direction:
+            continue
+        schedule_time = _parse_schedule_time(flight.get("schedule_time"))
+        if schedule_time is not None and not window_start <= schedule_time <= window_end:
+            continue
+        flights.append(flight)
+    return {"lastUpdate": data.get("lastUpdate"), "flights": flights}
+
+
+class AvinorAirportFeed:
+    """One XmlFeed download per airport, shared by every subscribed entry.
+
+    The feed is requested for both directions and the widest time window any
+    subscriber asked for. Concurrent callers share the in-flight request, and
+    a result younger than `max_age` seconds is handed out without refetching.
+    """
+
+    def __init__(self, api: AvinorApiClient, airport: str, *, max_age: float = FEED_MAX_AGE_SECONDS) -> None:
+        self._api = api
+        self.airport = airport
+        self._max_age = max_age
+        self._windows: Dict[str, _Window] = {}
+        self._data: Optional[Dict[str, Any]] = None
+        self._data_window: _Window = (None, None)
+        self._fetched_at = 0.0
+        self._single_flight = SingleFlight()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._windows)
+
+    def subscribe(self, key: str, *, time_from: Optional[int], time_to: Optional[int]) -> None:
+        self._windows[key] = _window(time_from, time_to)
+
+    def unsubscribe(self, key: str) -> None:
+        self._windows.pop(key, None)
+
+    def _requested_window(self) -> _Window:
+        """The widest window any subscriber asked for.
+
+        A side stays unset (server default) while no subscriber set it.
+        """
+        windows = list(self._windows.values())
+        effective = [_effective_window(window) for window in windows]
+        return (
+            None if all(window[0] is None for window in windows) else max(hours[0] for hours in effective),
+            None if all(window[1] is None for window in windows) else max(hours[1] for hours in effective),
+        )
+
+    def _is_fresh(self, window: _Window) -> bool:
+        if self._data is None:
+            return False
+        if time.monotonic() - self._fetched_at >= self._max_age:
+            return False
+        have, want = _effective_window(self._data_window), _effective_window(window)
+        return have[0] >= want[0] and have[1] >= want[1]
+
+    async def async_get(self) -> Dict[str, Any]:
+        """Return the shared dataset, fetching it only when needed."""
+        window = self._requested_window()
+        if self._is_fresh(window):
+            return self._data  # type: ignore[return-value]
+
+        return await self._single_flight.run(self.airport, lambda: self._async_fetch(window))
+
+    async def _async_fetch(self, window: _Window) -> Dict[str, Any]:
+        _LOGGER.debug("Fetching shared Avinor feed for %s (window -%sh/+%sh)", self.airport, *_effective_window(window))
+        known_last_update = None
+        if self._data is not None and self._data_window == window:
+            known_last_update = self._data.get("lastUpdate")
+        data = await self._api.async_get_flights(
+            airport=self.airport,
+            time_from=window[0],
+            time_to=window[1],
+            known_last_update=known_last_update,
+        )
+        if data is None:
+            # Unchanged upstream: hand out the very same object so callers can skip work.
+            self._fetched_at = time.monotonic()
+            return self._data  # type: ignore[return-value]
+        self._data = data
+        self._data_window = window
+        self._fetched_at = time.monotonic()
+        return data
+
+
+class AvinorFeedRegistry:
+    """Domain-wide registry handing out one `AvinorAirportFeed` per airport."""
+
+    def __init__(self, api: AvinorApiClient, *, max_age: float = FEED_MAX_AGE_SECONDS) -> None:
+        self._api = api
+        self._max_age = max_age
+        self._feeds: Dict[str, AvinorAirportFeed] = {}
+
+    def subscribe(
+        self,
+        key: str,
+        *,
+        airport: str,
+        time_from: Optional[int],
+        time_to: Optional[int],
+    ) -> AvinorAirportFeed:
+        code = (airport or "").strip().upper()
+        feed = self._feeds.get(code)
+        if feed is None:
+            feed = self._feeds[code] = AvinorAirportFeed(self._api, code, max_age=self._max_age)
+        feed.subscribe(key, time_from=time_from, time_to=time_to)
+        return feed
+
+    def unsubscribe(self, key: str, *, airport: str) -> None:
+        code = (airport or "").strip().upper()
+        feed = self._feeds.get(code)
+        if feed is None:
+            return
+        feed.unsubscribe(key)
+        if not feed.has_subscribers:
+            self._feeds.pop(code, None)
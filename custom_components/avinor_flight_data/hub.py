@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+"""Domain-wide API clients and the HTTP session they share."""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .api import AvinorApiClient
+from .breaker import CircuitBreakerRegistry
+from .cache import AirportMetadataCache, ResponseCache
+from .const import AIRLABS_API_BASE, API_BASE
+from .feed import AvinorFeedRegistry
+from .quota import AirlabsQuotaScheduler
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from .airlabs import AirlabsApiClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ClientHub:
+    """One Avinor and one Airlabs client shared by every entry and service call.
+
+    Besides the session, the clients share the circuit breakers, in-flight
+    coalescing, response cache, airport metadata cache and Airlabs budget.
+    Entries `acquire` the hub on setup and `release` it on unload; `release`
+    tells when no entry holds it any more. The Airlabs client is created
+    (and its module imported) on first use.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        airport_cache: AirportMetadataCache | None = None,
+        owns_session: bool = True,
+        avinor_base_url: str = API_BASE,
+        airlabs_base_url: str = AIRLABS_API_BASE,
+    ) -> None:
+        self.session = session
+        self._owns_session = owns_session
+        self._airlabs_base_url = airlabs_base_url
+        self.breakers = CircuitBreakerRegistry()
+        self.single_flight = SingleFlight()
+        self.response_cache = ResponseCache()
+        self.airport_cache = airport_cache if airport_cache is not None else AirportMetadataCache()
+        self.budget = AirlabsQuotaScheduler()
+        self.avinor = AvinorApiClient(
+            session,
+            stream_parse=True,
+            breakers=self.breakers,
+            single_flight=self.single_flight,
+            response_cache=self.response_cache,
+            base_url=avinor_base_url,
+        )
+        self._airlabs: AirlabsApiClient | None = None
+        self.feeds = AvinorFeedRegistry(self.avinor)
+        self._users = 0
+
+    @property
+    def airlabs(self) -> AirlabsApiClient:
+        if self._airlabs is None:
+            from .airlabs import AirlabsApiClient
+
+            self._airlabs = AirlabsApiClient(
+                self.session,
+                airport_cache=self.airport_cache,
+                budget=self.budget,
+                breakers=self.breakers,
+                single_flight=self.single_flight,
+                response_cache=self.response_cache,
+                base_url=self._airlabs_base_url,
+            )
+        return self._airlabs
+
+    @property
+    def in_use(self) -> bool:
+        return self._users > 0
+
+    def acquire(self) -> None:
+        self._users += 1
+
+    def release(self) -> bool:
+        """Release one user; True when the hub is now unused."""
+        self._users = max(self._users - 1, 0)
+        return self._users == 0
+
+    async def async_close(self, *_: Any) -> None:
+        """Close the shared session (if owned); safe to call more than once."""
+        if self._owns_session and not self.session.closed:
+            _LOGGER.debug("Closing shared HTTP session")
+            await self.session.close()
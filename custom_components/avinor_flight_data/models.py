@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""Flight data model shared by the api, coordinator and sensor layers."""
+
+from typing import Any, Dict, Iterator, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+FLIGHT_FIELDS: Tuple[str, ...] = (
+    "uniqueId",
+    "airline",
+    "flightId",
+    "dom_int",
+    "schedule_time",
+    "arr_dep",
+    "airport",
+    "check_in",
+    "gate",
+    "status_code",
+    "status_time",
+)
+
+
+class FlightRecord:
+    """Compact, immutable flight record.
+
+    Uses `__slots__` instead of a per-flight dict. Read access mirrors the
+    dicts this replaced (`record["gate"]`, `record.get("gate")`, `dict(record)`),
+    so templates and helpers keep working; plain dicts are only produced at
+    the Home Assistant attribute boundary via `as_dict()`.
+    """
+
+    __slots__ = FLIGHT_FIELDS
+
+    def __init__(
+        self,
+        *,
+        uniqueId: Any = None,
+        airline: Any = None,
+        flightId: Any = "",
+        dom_int: Any = None,
+        schedule_time: Any = None,
+        arr_dep: Any = None,
+        airport: Any = None,
+        check_in: Any = None,
+        gate: Any = None,
+        status_code: Any = None,
+        status_time: Any = None,
+    ) -> None:
+        _set = object.__setattr__
+        _set(self, "uniqueId", uniqueId)
+        _set(self, "airline", airline)
+        _set(self, "flightId", flightId)
+        _set(self, "dom_int", dom_int)
+        _set(self, "schedule_time", schedule_time)
+        _set(self, "arr_dep", arr_dep)
+        _set(self, "airport", airport)
+        _set(self, "check_in", check_in)
+        _set(self, "gate", gate)
+        _set(self, "status_code", status_code)
+        _set(self, "status_time", status_time)
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "FlightRecord":
+        """Build a record from a mapping, ignoring unknown keys."""
+        return cls(**{key: data[key] for key in FLIGHT_FIELDS if key in data})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("FlightRecord is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("FlightRecord is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FLIGHT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in FLIGHT_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FLIGHT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(FLIGHT_FIELDS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in FLIGHT_FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return FLIGHT_FIELDS
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, key) for key in FLIGHT_FIELDS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in FLIGHT_FIELDS}
+
+    def replace(self, **changes: Any) -> "FlightRecord":
+        return FlightRecord(**{**self.as_dict(), **changes})
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FlightRecord):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __hash__(self) -> int:
+        return hash(self.values())
+
+    def __reduce__(self):
+        return (_rebuild_flight_record, (self.values(),))
+
+    def __repr__(self) -> str:
+        return f"FlightRecord({self.flightId!r}, uniqueId={self.uniqueId!r})"
+
+
+def _rebuild_flight_record(values: Tuple[Any, ...]) -> FlightRecord:
+    return FlightRecord(**dict(zip(FLIGHT_FIELDS, values)))
+
+
+def flight_as_dict(flight: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return a plain dict for a flight record (or an already plain mapping)."""
+    if isinstance(flight, FlightRecord):
+        return flight.as_dict()
+    return dict(flight)
+
+
+def flight_key(flight: Mapping[str, Any]) -> str:
+    """Return the identity used to match a flight across polls.
+
+    Avinor's `uniqueId` is stable per flight; Airlabs records carry a
+    composite identity in the same field. Falls back to flight id + time.
+    """
+    unique_id = flight.get("uniqueId")
+    if unique_id:
+        return str(unique_id)
+    return f"{flight.get('flightId') or ''}|{flight.get('schedule_time') or ''}"
+
+
+class FlightDelta(NamedTuple):
+    """Difference between two consecutive flight lists, keyed by `flight_key`."""
+
+    added: Tuple[str, ...]
+    removed: Tuple[str, ...]
+    # flight key -> names of the fields that changed
+    changed: Dict[str, Tuple[str, ...]]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "added": list(self.added),
+            "removed": list(self.removed),
+            "changed": {key: list(fields) for key, fields in self.changed.items()},
+        }
+
+
+def diff_flights(
+    previous: Optional[Sequence[Mapping[str, Any]]],
+    current: Sequence[Mapping[str, Any]],
+) -> FlightDelta:
+    """Compute added/removed/changed flights between two polls."""
+    old = {flight_key(flight): flight for flight in previous or ()}
+    added = []
+    changed: Dict[str, Tuple[str, ...]] = {}
+    seen = set()
+    for flight in current:
+        key = flight_key(flight)
+        seen.add(key)
+        before = old.get(key)
+        if before is None:
+            added.append(key)
+            continue
+        if before == flight:
+            continue
+        fields = tuple(field for field in FLIGHT_FIELDS if before.get(field) != flight.get(field))
+        if fields:
+            changed[key] = fields
+    removed = tuple(key for key in old if key not in seen)
+    return FlightDelta(tuple(added), removed, changed)
+
+
+# Fields the coordinator pre-buckets flights by.
+INDEX_FIELDS: Tuple[str, ...] = ("dom_int", "arr_dep", "airline")
+
+
+def build_flight_index(flights: Sequence[Mapping[str, Any]]) -> Dict[str, Dict[str, Tuple[Any, ...]]]:
+    """Bucket flights by `dom_int`, `arr_dep` and airline.
+
+    Values are normalized (stripped, upper-case) and buckets keep the
+    original flight order, so `index["dom_int"]["D"]` equals a linear
+    filter on `dom_int == "D"`.
+    """
+    buckets: Dict[str, Dict[str, list]] = {field: {} for field in INDEX_FIELDS}
+    for flight in flights:
+        for field in INDEX_FIELDS:
+            value = str(flight.get(field) or "").strip().upper()
+            buckets[field].setdefault(value, []).append(flight)
+    return {field: {value: tuple(items) for value, items in by_value.items()} for field, by_value in buckets.items()}
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+"""Domain-wide Airlabs request budget.
+
+Every Airlabs request (schedule polling, airport lookups and the
+`get_flight_details` service) draws from one token bucket per API key. The
+bucket refills at the rate the monthly quota allows. Interactive requests
+may use the last tokens, while background polls leave a reserve and
+stretch their interval instead of exhausting the quota.
+"""
+
+import asyncio
+from datetime import timedelta
+import itertools
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from .const import (
+    AIRLABS_BACKGROUND_RESERVE_RATIO,
+    AIRLABS_BURST_RATIO,
+    AIRLABS_INTERACTIVE_MAX_WAIT,
+    DEFAULT_AIRLABS_MONTHLY_QUOTA,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_SECONDS_PER_MONTH = 30 * 24 * 3600
+
+
+class AirlabsBudgetExceeded(RuntimeError):
+    """Raised when a request does not fit in the remaining Airlabs budget."""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to `capacity`."""
+
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        self.capacity = max(float(capacity), 1.0)
+        self.refill_per_second = max(float(refill_per_second), 1e-9)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self.consumed = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def try_take(self, *, floor: float = 0.0) -> bool:
+        """Take one token if at least one is available above `floor`."""
+        self._refill()
+        if self._tokens - 1 < floor:
+            return False
+        self._tokens -= 1
+        self.consumed += 1
+        return True
+
+    def seconds_until(self, *, floor: float = 0.0) -> float:
+        """Seconds until `try_take(floor=floor)` can succeed."""
+        missing = floor + 1 - self.tokens
+        return max(missing, 0.0) / self.refill_per_second
+
+
+class AirlabsQuotaScheduler:
+    """One token bucket per Airlabs API key, shared by the whole domain.
+
+    Waiting requests are served in priority order (lower value first).
+    Background requests never take the reserve kept for interactive
+    service calls and by default fail immediately rather than waiting.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._pollers: Dict[str, set] = {}
+        self._waiters: Dict[str, List[Tuple[int, int]]] = {}
+        self._seq = itertools.count()
+
+    def configure(self, api_key: str, *, monthly_quota: int | None = None) -> TokenBucket:
+        """Create or resize the bucket for `api_key`."""
+        quota = max(int(monthly_quota or DEFAULT_AIRLABS_MONTHLY_QUOTA), 1)
+        capacity = max(quota * AIRLABS_BURST_RATIO, 1.0)
+        refill = quota / _SECONDS_PER_MONTH
+        bucket = self._buckets.get(api_key)
+        if bucket is None:
+            bucket = self._buckets[api_key] = TokenBucket(capacity, refill)
+        else:
+            bucket.capacity = capacity
+            bucket.refill_per_second = refill
+        return bucket
+
+    def bucket(self, api_key: str) -> TokenBucket:
+        return self._buckets.get(api_key) or self.configure(api_key)
+
+    def register_poller(self, api_key: str, key: str) -> None:
+        self._pollers.setdefault(api_key, set()).add(key)
+
+    def unregister_poller(self, key: str) -> None:
+        for pollers in self._pollers.values():
+            pollers.discard(key)
+
+    def _floor(self, bucket: TokenBucket, priority: int) -> float:
+        if priority <= PRIORITY_INTERACTIVE:
+            return 0.0
+        return min(bucket.capacity * AIRLABS_BACKGROUND_RESERVE_RATIO, bucket.capacity - 1)
+
+    async def acquire(
+        self,
+        api_key: str,
+        *,
+        priority: int = PRIORITY_BACKGROUND,
+        max_wait: float | None = None,
+    ) -> None:
+        """Wait for a token for `api_key` or raise `AirlabsBudgetExceeded`."""
+        bucket = self.bucket(api_key)
+        floor = self._floor(bucket, priority)
+        if max_wait is None:
+            max_wait = AIRLABS_INTERACTIVE_MAX_WAIT if priority <= PRIORITY_INTERACTIVE else 0.0
+        deadline = time.monotonic() + max_wait
+        waiters = self._waiters.setdefault(api_key, [])
+        ticket = (priority, next(self._seq))
+        waiters.append(ticket)
+        try:
+            while True:
+                # Only the best-ranked waiter may take a token.
+                if min(waiters) == ticket and bucket.try_take(floor=floor):
+                    return
+                wait = max(bucket.seconds_until(floor=floor), 0.05)
+                if time.monotonic() + wait > deadline:
+                    raise AirlabsBudgetExceeded(
+                        f"Airlabs request budget exhausted ({bucket.tokens:.1f} requests left)"
+                    )
+                await asyncio.sleep(wait)
+        finally:
+            waiters.remove(ticket)
+
+    def poll_interval(self, api_key: str, base: timedelta, *, requests_per_poll: float = 1.0) -> timedelta:
+        """Return the polling interval background pollers of `api_key` should use.
+
+        With a healthy budget this is `base`. Below half of the burst capacity
+        the interval stretches linearly towards the sustainable rate, the
+        interval at which all pollers together spend exactly the refill rate.
+        """
+        bucket = self.bucket(api_key)
+        pollers = max(len(self._pollers.get(api_key, ())), 1)
+        sustainable = pollers * max(requests_per_poll, 1.0) / bucket.refill_per_second
+        fill = bucket.tokens / bucket.capacity
+        if fill >= 0.5 or sustainable <= base.total_seconds():
+            return base
+        # fill 0.5 -> base, fill 0 -> sustainable
+        stretch = 1 - fill / 0.5
+        seconds = base.total_seconds() + (sustainable - base.total_seconds()) * stretch
+        return timedelta(seconds=seconds)
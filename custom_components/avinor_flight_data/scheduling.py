@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+"""Adaptive polling interval for the coordinators.
+
+Polls speed up while flights in the window are about to arrive or depart (or
+just changed status), slow down at night and when the window is empty, and
+are timed to land just after the feed's next expected `lastUpdate`.
+`RefreshStagger` spreads the refreshes of all entries across the interval,
+or by a few seconds around that target once the feed's cadence is known.
+"""
+
+from datetime import datetime, timedelta, timezone, tzinfo
+import hashlib
+import math
+from statistics import median
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from .const import (
+    ADAPTIVE_FAST_INTERVAL_SECONDS,
+    ADAPTIVE_FEED_LAG_SECONDS,
+    ADAPTIVE_IMMINENT_AFTER_MINUTES,
+    ADAPTIVE_IMMINENT_BEFORE_MINUTES,
+    ADAPTIVE_NIGHT_END_HOUR,
+    ADAPTIVE_NIGHT_START_HOUR,
+    ADAPTIVE_QUIET_INTERVAL_SECONDS,
+    STAGGER_ENTRY_JITTER_SECONDS,
+    STAGGER_GROUP_JITTER_RATIO,
+)
+from .feed import _parse_schedule_time
+from .models import FlightDelta
+
+# Avinor status codes after which a flight no longer changes: arrived, departed, cancelled.
+FINAL_STATUS_CODES = frozenset({"A", "D", "C"})
+
+# Number of `lastUpdate` gaps kept to estimate the feed's publish cadence.
+_CADENCE_SAMPLES = 8
+
+
+def _is_imminent(flight: Mapping[str, Any], now: datetime) -> bool:
+    if str(flight.get("status_code") or "").strip().upper() in FINAL_STATUS_CODES:
+        return False
+    schedule_time = _parse_schedule_time(flight.get("schedule_time"))
+    if schedule_time is None:
+        return False
+    return (
+        now - timedelta(minutes=ADAPTIVE_IMMINENT_AFTER_MINUTES)
+        <= schedule_time
+        <= now + timedelta(minutes=ADAPTIVE_IMMINENT_BEFORE_MINUTES)
+    )
+
+
+def _is_night(now: datetime, tz: tzinfo | None) -> bool:
+    hour = now.astimezone(tz).hour if tz is not None else now.hour
+    if ADAPTIVE_NIGHT_START_HOUR <= ADAPTIVE_NIGHT_END_HOUR:
+        return ADAPTIVE_NIGHT_START_HOUR <= hour < ADAPTIVE_NIGHT_END_HOUR
+    return hour >= ADAPTIVE_NIGHT_START_HOUR or hour < ADAPTIVE_NIGHT_END_HOUR
+
+
+def traffic_interval(
+    flights: Iterable[Mapping[str, Any]],
+    *,
+    base: timedelta,
+    delta: Optional[FlightDelta] = None,
+    now: datetime | None = None,
+    tz: tzinfo | None = None,
+) -> timedelta:
+    """Pick the polling interval for the current traffic in the window.
+
+    - fast: a flight is close to its `schedule_time`, or a status just changed
+    - quiet: the window is empty, or it is night and nothing is imminent
+    - `base` otherwise
+    """
+    now = now or datetime.now(timezone.utc)
+    fast = min(base, timedelta(seconds=ADAPTIVE_FAST_INTERVAL_SECONDS))
+    quiet = max(base, timedelta(seconds=ADAPTIVE_QUIET_INTERVAL_SECONDS))
+
+    if delta is not None and any("status_code" in fields for fields in delta.changed.values()):
+        return fast
+    flights = list(flights)
+    if not flights:
+        return quiet
+    if any(_is_imminent(flight, now) for flight in flights):
+        return fast
+    if _is_night(now, tz):
+        return quiet
+    return base
+
+
+class FeedCadence:
+    """Learns how often the feed publishes a new `lastUpdate`.
+
+    The gap between consecutive distinct `lastUpdate` values is tracked and
+    the median is used to predict the next one, so `align` can time the poll
+    to land just after it.
+    """
+
+    def __init__(self) -> None:
+        self._last: Optional[datetime] = None
+        self._gaps: List[float] = []
+
+    @property
+    def period(self) -> Optional[float]:
+        return median(self._gaps) if self._gaps else None
+
+    def observe(self, last_update: Any) -> None:
+        stamp = _parse_schedule_time(last_update)
+        if stamp is None or (self._last is not None and stamp <= self._last):
+            return
+        if self._last is not None:
+            self._gaps.append((stamp - self._last).total_seconds())
+            del self._gaps[:-_CADENCE_SAMPLES]
+        self._last = stamp
+
+    def align(self, interval: timedelta, *, now: datetime | None = None) -> timedelta:
+        """Shorten `interval` so the poll lands just after the next expected update.
+
+        Only ever shortens, never below the fast interval; when no update is
+        expected within `interval` it is returned unchanged.
+        """
+        period = self.period
+        if self._last is None or period is None or period <= 0:
+            return interval
+        now = now or datetime.now(timezone.utc)
+        expected = self._last + timedelta(seconds=period + ADAPTIVE_FEED_LAG_SECONDS)
+        # Missed updates: move on to the next expected one.
+        while expected <= now:
+            expected += timedelta(seconds=period)
+        wait = expected - now
+        if wait >= interval:
+            return interval
+        return max(wait, min(interval, timedelta(seconds=ADAPTIVE_FAST_INTERVAL_SECONDS)))
+
+
+def _unit_hash(value: str) -> float:
+    """Deterministic value in [0, 1) for `value` (stable across restarts)."""
+    digest = hashlib.sha1(value.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+class StaggerSlot:
+    """One entry's place in a `RefreshStagger`."""
+
+    def __init__(self, stagger: "RefreshStagger", group: str, key: str) -> None:
+        self._stagger = stagger
+        self.group = group
+        self.key = key
+
+    def align(self, interval: timedelta, *, now: datetime | None = None) -> timedelta:
+        return self._stagger.align(self.group, self.key, interval, now=now)
+
+    def first_delay(self, interval: timedelta, *, now: datetime | None = None) -> timedelta:
+        return self._stagger.first_delay(self.group, self.key, interval, now=now)
+
+    def jitter(self, limit: timedelta) -> timedelta:
+        return self._stagger.jitter(self.group, self.key, limit)
+
+
+class RefreshStagger:
+    """Spreads coordinator refreshes of all entries evenly over the interval.
+
+    Each group gets a fixed phase within the interval; groups are spaced
+    evenly with a small deterministic jitter. Entries in the same group
+    (entries sharing one airport feed) fire within a few seconds of each
+    other so they still share one download, but not in the same instant.
+    Refreshes land on a wall-clock grid, so the spread holds however many
+    coordinators were started at once.
+    """
+
+    def __init__(self) -> None:
+        self._members: Dict[str, set] = {}
+        self._phases: Dict[str, float] = {}
+
+    def register(self, group: str, key: str) -> StaggerSlot:
+        self.unregister(key)
+        self._members.setdefault(group, set()).add(key)
+        self._rebalance()
+        return StaggerSlot(self, group, key)
+
+    def unregister(self, key: str) -> None:
+        for group, members in list(self._members.items()):
+            members.discard(key)
+            if not members:
+                del self._members[group]
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        groups = sorted(self._members, key=_unit_hash)
+        count = len(groups)
+        self._phases = {
+            group: (index + STAGGER_GROUP_JITTER_RATIO * _unit_hash(group)) / count
+            for index, group in enumerate(groups)
+        }
+
+    def phase(self, group: str) -> Optional[float]:
+        return self._phases.get(group)
+
+    def align(
+        self,
+        group: str,
+        key: str,
+        interval: timedelta,
+        *,
+        now: datetime | None = None,
+    ) -> timedelta:
+        """Return the delay that lands the next refresh on the group's slot.
+
+        The delay is between half and one and a half `interval`, so the
+        average polling rate stays the same.
+        """
+        return self._delay_to_slot(group, key, interval, now=now, earliest=0.5)
+
+    def first_delay(
+        self,
+        group: str,
+        key: str,
+        interval: timedelta,
+        *,
+        now: datetime | None = None,
+    ) -> timedelta:
+        """Return the delay (under one `interval`) until the group's next slot.
+
+        Used for the first refresh after startup, so entries set up together
+        don't all fetch at once.
+        """
+        return self._delay_to_slot(group, key, interval, now=now, earliest=0.0)
+
+    def jitter(self, group: str, key: str, limit: timedelta) -> timedelta:
+        """Return a fixed offset under `limit` for this entry.
+
+        Spreads polls that are already timed to a feed publish over a few
+        seconds instead of moving them to the group's slot.
+        """
+        phase = self._phases.get(group)
+        span = limit.total_seconds()
+        if phase is None or span <= 0:
+            return timedelta(0)
+        offset = phase * span + STAGGER_ENTRY_JITTER_SECONDS * _unit_hash(key)
+        return timedelta(seconds=min(offset, span))
+
+    def _delay_to_slot(
+        self,
+        group: str,
+        key: str,
+        interval: timedelta,
+        *,
+        now: datetime | None,
+        earliest: float,
+    ) -> timedelta:
+        phase = self._phases.get(group)
+        period = interval.total_seconds()
+        if phase is None or period <= 0:
+            return interval if earliest else timedelta(0)
+        now = now or datetime.now(timezone.utc)
+        current = now.timestamp()
+        offset = phase * period + min(STAGGER_ENTRY_JITTER_SECONDS * _unit_hash(key), period / 2)
+        target = math.floor(current / period) * period + offset
+        while target < current + period * earliest:
+            target += period
+        return timedelta(seconds=target - current)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Mapping, NamedTuple, Sequence
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -18,11 +18,18 @@ from .const import (
     CONF_TIME_TO,
     CONF_FLIGHT_TYPE,
     CONF_SCHEDULE_SOURCE,
+    CONF_ATTRIBUTE_PROFILE,
+    ATTRIBUTE_PROFILE_CAPPED,
+    ATTRIBUTE_PROFILE_FULL_UNRECORDED,
+    ATTRIBUTE_PROFILE_SUMMARY,
+    ATTRIBUTE_CAPPED_MAX_FLIGHTS,
     DEFAULT_SCHEDULE_SOURCE,
+    DEFAULT_ATTRIBUTE_PROFILE,
 )
+from .models import flight_as_dict, flight_key
 
 
-def _compact_flight(flight: dict[str, Any]) -> dict[str, Any]:
+def _compact_flight(flight: Mapping[str, Any]) -> dict[str, Any]:
     """Return a small, HA-friendly representation of a flight.
 
     Keeps the full `flights` attribute untouched, but provides a compact list
@@ -41,7 +48,7 @@ def _compact_flight(flight: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _apply_flight_type_filter(flights: list[dict[str, Any]], flight_type: str | None) -> list[dict[str, Any]]:
+def _apply_flight_type_filter(flights: Sequence[Mapping[str, Any]], flight_type: str | None) -> Sequence[Mapping[str, Any]]:
     """Filter a flight list by Avinor's `dom_int` field.
 
     Implemented at the entity level to avoid affecting other entities that may
@@ -50,7 +57,7 @@ def _apply_flight_type_filter(flights: list[dict[str, Any]], flight_type: str |
     ft = (flight_type or "").strip().upper()
     if not ft:
         return flights
-    out: list[dict[str, Any]] = []
+    out: list[Mapping[str, Any]] = []
     for flight in flights:
         dom_int = str(flight.get("dom_int") or "").strip().upper()
         if dom_int == ft:
@@ -58,17 +65,41 @@ def _apply_flight_type_filter(flights: list[dict[str, Any]], flight_type: str |
     return out
 
 
+class _FlightsView(NamedTuple):
+    """This entity's slice of one coordinator update."""
+
+    flights: Sequence[Mapping[str, Any]]
+    keys: tuple[str, ...]
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
 
-    async_add_entities([AvinorFlightsSensor(entry, coordinator)])
+    conf = {**entry.data, **entry.options}
+    # The recorder exclusion list is class-level in Home Assistant, hence a subclass.
+    if conf.get(CONF_ATTRIBUTE_PROFILE) == ATTRIBUTE_PROFILE_FULL_UNRECORDED:
+        sensor_cls = AvinorFlightsUnrecordedSensor
+    else:
+        sensor_cls = AvinorFlightsSensor
+
+    async_add_entities([sensor_cls(entry, coordinator)])
 
 
 class AvinorFlightsSensor(CoordinatorEntity, SensorEntity):
     _attr_icon = "mdi:airplane"
     _attr_state_class = SensorStateClass.MEASUREMENT
 
+    # Coordinator data, flight keys of this entity's slice and the feed's lastUpdate
+    # at the last state write.
+    _written_data: dict[str, Any] | None = None
+    _written_keys: tuple[str, ...] | None = None
+    _written_last_update: str | None = None
+    # Per-update memoization, keyed by the identity of coordinator.data.
+    _conf_cache: Dict[str, Any] | None = None
+    _view_cache: tuple[Any, _FlightsView] | None = None
+    _attributes_cache: tuple[Any, dict[str, Any]] | None = None
+
     def __init__(self, entry: ConfigEntry, coordinator) -> None:
         super().__init__(coordinator)
         self._entry = entry
@@ -85,10 +116,33 @@ class AvinorFlightsSensor(CoordinatorEntity, SensorEntity):
             name_suffix = f"{name_suffix} Airlabs"
         self._attr_name = f"Avinor {airport} {direction} {name_suffix}"
 
+    @property
+    def _conf(self) -> Dict[str, Any]:
+        """Entry data merged with options; options changes reload the entry."""
+        if self._conf_cache is None:
+            self._conf_cache = {**self._entry.data, **self._entry.options}
+        return self._conf_cache
+
+    def _view(self) -> _FlightsView:
+        """Filtered flights for the current coordinator data, built once per update."""
+        data = self.coordinator.data
+        cached = self._view_cache
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        flight_type = (self._conf.get(CONF_FLIGHT_TYPE) or "").strip().upper()
+        index = (data or {}).get("index")
+        if flight_type and index is not None:
+            # Pre-bucketed by the coordinator; no scan needed.
+            flights = index["dom_int"].get(flight_type, ())
+        else:
+            flights = _apply_flight_type_filter((data or {}).get("flights", []), flight_type)
+        view = _FlightsView(flights, tuple(flight_key(f) for f in flights))
+        self._view_cache = (data, view)
+        return view
+
     @property
     def device_info(self):
-        conf = {**self._entry.data, **self._entry.options}
-        airport = conf.get(CONF_AIRPORT)
+        airport = self._conf.get(CONF_AIRPORT)
         return {
             "identifiers": {(DOMAIN, f"device_{airport}")},
             "name": f"Avinor {airport}",
@@ -98,19 +152,25 @@ class AvinorFlightsSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self) -> Any:
-        conf: Dict[str, Any] = {**self._entry.data, **self._entry.options}
-        flights = self.coordinator.data.get("flights", []) if self.coordinator.data else []
-        flights = _apply_flight_type_filter(flights, conf.get(CONF_FLIGHT_TYPE))
-        return len(flights)
+        if self.coordinator.data is None:
+            # First refresh still running in the background: unknown, not zero.
+            return None
+        return len(self._view().flights)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        conf: Dict[str, Any] = {**self._entry.data, **self._entry.options}
-        data = self.coordinator.data or {}
-        flights = _apply_flight_type_filter(data.get("flights", []), conf.get(CONF_FLIGHT_TYPE))
+        data = self.coordinator.data
+        cached = self._attributes_cache
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        conf = self._conf
+        data = data or {}
+        flights = self._view().flights
+        profile = conf.get(CONF_ATTRIBUTE_PROFILE, DEFAULT_ATTRIBUTE_PROFILE)
         compact_max = 10
         flights_summary = [_compact_flight(f) for f in flights[:compact_max]]
-        return {
+        attributes = {
             "airport": conf.get(CONF_AIRPORT),
             "direction": conf.get(CONF_DIRECTION),
             "flight_type": conf.get(CONF_FLIGHT_TYPE),
@@ -118,11 +178,53 @@ class AvinorFlightsSensor(CoordinatorEntity, SensorEntity):
             "time_from": conf.get(CONF_TIME_FROM),
             "time_to": conf.get(CONF_TIME_TO),
             "last_update": data.get("lastUpdate"),
-            "flights": flights,
-            "flights_summary": flights_summary,
-            "flights_summary_max": compact_max,
+            "attribute_profile": profile,
         }
 
+        # Flight records become plain dicts only here, at the attribute boundary.
+        if profile == ATTRIBUTE_PROFILE_CAPPED:
+            attributes["flights"] = [flight_as_dict(f) for f in flights[:ATTRIBUTE_CAPPED_MAX_FLIGHTS]]
+            attributes["flights_max"] = ATTRIBUTE_CAPPED_MAX_FLIGHTS
+        elif profile != ATTRIBUTE_PROFILE_SUMMARY:
+            attributes["flights"] = [flight_as_dict(f) for f in flights]
+
+        attributes["flights_summary"] = flights_summary
+        attributes["flights_summary_max"] = compact_max
+        self._attributes_cache = (self.coordinator.data, attributes)
+        return attributes
+
     @property
     def should_poll(self) -> bool:
         return False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this entity's slice of the flights changed."""
+        if self._slice_changed():
+            self.async_write_ha_state()
+
+    def _slice_changed(self) -> bool:
+        data = self.coordinator.data
+        if data is None:
+            return True
+        if data is self._written_data:
+            return False
+        keys = self._view().keys
+        delta = data.get("delta")
+        last_update = data.get("lastUpdate")
+        changed = (
+            delta is None
+            or keys != self._written_keys
+            or last_update != self._written_last_update
+            or any(key in delta.changed for key in keys)
+        )
+        self._written_data = data
+        self._written_keys = keys
+        self._written_last_update = last_update
+        return changed
+
+
+class AvinorFlightsUnrecordedSensor(AvinorFlightsSensor):
+    """Flights sensor whose full `flights` attribute is kept out of the recorder."""
+
+    _unrecorded_attributes = frozenset({"flights"})
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+"""Coalescing of identical in-flight API requests."""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+
+def request_key(kind: str, url: str, params: Optional[Mapping[str, Any]] = None, *extra: Hashable) -> Tuple:
+    """Key identifying one request: kind, url and the params in sorted order."""
+    return (kind, url, tuple(sorted((params or {}).items())), *extra)
+
+
+class SingleFlight:
+    """Share one in-flight call between identical concurrent requests.
+
+    The first caller for a key starts the call; callers arriving while it
+    runs await the same result (or exception). Nothing is kept once it
+    finishes. A caller being cancelled does not cancel the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[_T]]) -> _T:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(factory())
+            self._calls[key] = call
+            call.add_done_callback(partial(self._done, key))
+        return await asyncio.shield(call)
+
+    def _done(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            # Waiters may all have been cancelled; avoid "exception never retrieved".
+            call.exception()
+
+
+async def coalesce(
+    single_flight: Optional[SingleFlight],
+    key: Hashable,
+    factory: Callable[[], Awaitable[_T]],
+) -> _T:
+    """Run `factory` through `single_flight`, or directly without one."""
+    if single_flight is None:
+        return await factory()
+    return await single_flight.run(key, factory)
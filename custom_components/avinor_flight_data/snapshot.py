@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+"""Last-known-good coordinator data persisted across restarts."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from .const import SNAPSHOT_MAX_AGE_SECONDS, SNAPSHOT_SAVE_DELAY
+from .models import FLIGHT_FIELDS, FlightRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Compact snapshots of every entry's last dataset in one storage file.
+
+    Flights are stored as value rows in `FLIGHT_FIELDS` order. Writes from
+    all entries are batched into one debounced save.
+    """
+
+    def __init__(self, store: Any, *, max_age: float = SNAPSHOT_MAX_AGE_SECONDS) -> None:
+        self._store = store
+        self._max_age = max_age
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._load_task: Optional[asyncio.Future] = None
+
+    async def async_load(self) -> None:
+        """Load the stored snapshots once; later calls wait for the same load."""
+        if self._load_task is None:
+            self._load_task = asyncio.ensure_future(self._async_load())
+        await asyncio.shield(self._load_task)
+
+    async def _async_load(self) -> None:
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Failed loading flight snapshots: %s", err)
+            return
+        snapshots = (stored or {}).get("entries", {})
+        # Entries saved since startup win over what was on disk.
+        self._snapshots = {**snapshots, **self._snapshots}
+
+    def slot(self, key: str, *, source: str) -> "EntrySnapshot":
+        return EntrySnapshot(self, key, source)
+
+    def get(self, key: str, *, source: str) -> Optional[Dict[str, Any]]:
+        """Return the snapshot of `key` as coordinator data, or None.
+
+        Snapshots taken for another source (airport, direction, window) or
+        older than `max_age` are ignored.
+        """
+        snapshot = self._snapshots.get(key)
+        if not snapshot or snapshot.get("source") != source:
+            return None
+        if time.time() - float(snapshot.get("saved_at", 0)) > self._max_age:
+            return None
+        fields = snapshot.get("fields") or list(FLIGHT_FIELDS)
+        flights = [
+            FlightRecord.from_mapping(dict(zip(fields, row)))
+            for row in snapshot.get("flights", [])
+        ]
+        return {"lastUpdate": snapshot.get("lastUpdate"), "flights": flights}
+
+    def set(self, key: str, data: Dict[str, Any], *, source: str) -> None:
+        self._snapshots[key] = {
+            "source": source,
+            "saved_at": time.time(),
+            "lastUpdate": data.get("lastUpdate"),
+            "fields": list(FLIGHT_FIELDS),
+            "flights": [[flight.get(field) for field in FLIGHT_FIELDS] for flight in data.get("flights", [])],
+        }
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def remove(self, key: str) -> None:
+        if self._snapshots.pop(key, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {"entries": self._snapshots}
+
+
+class EntrySnapshot:
+    """One entry's snapshot in a `SnapshotStore`."""
+
+    def __init__(self, store: SnapshotStore, key: str, source: str) -> None:
+        self._store = store
+        self._key = key
+        self._source = source
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        return self._store.get(self._key, source=self._source)
+
+    def save(self, data: Dict[str, Any]) -> None:
+        self._store.set(self._key, data, source=self._source)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+"""Streaming parser for the Avinor XmlFeed.
+
+Feeds the response body to expat chunk by chunk and turns every `<flight>`
+element straight into a normalized flight record, without building the
+intermediate document tree that `xmltodict.parse` would.
+
+When the previous `lastUpdate` is known, parsing stops at the `<flights>`
+start tag if it still carries the same value.
+"""
+
+from typing import Any, Dict, List, Optional
+from xml.parsers import expat
+
+from .models import FlightRecord
+
+# <airport><flights><flight><field/></flight></flights></airport>
+_FLIGHTS_DEPTH = 2
+_FLIGHT_DEPTH = 3
+_FIELD_DEPTH = 4
+
+# Child elements copied verbatim (element name -> record key).
+_TEXT_FIELDS = {
+    "airline": "airline",
+    "dom_int": "dom_int",
+    "schedule_time": "schedule_time",
+    "arr_dep": "arr_dep",
+    "airport": "airport",
+    "check_in": "check_in",
+    "gate": "gate",
+}
+# Avinor uses `flight_id`; older payloads used `flightId`.
+_FLIGHT_ID_FIELDS = ("flight_id", "flightId")
+
+
+class FeedUnchanged(Exception):
+    """Raised when the feed's `lastUpdate` matches the previously seen value."""
+
+
+def _new_record(unique_id: Optional[str]) -> Dict[str, Any]:
+    return {
+        "uniqueId": unique_id,
+        "airline": None,
+        "flightId": "",
+        "dom_int": None,
+        "schedule_time": None,
+        "arr_dep": None,
+        "airport": None,
+        "check_in": None,
+        "gate": None,
+        "status_code": None,
+        "status_time": None,
+    }
+
+
+class AvinorFlightStreamParser:
+    """Incremental XmlFeed parser producing the same records as `async_get_flights`.
+
+    Call `feed()` with each chunk of the body and `close()` once at the end.
+    `feed()` raises `FeedUnchanged` as soon as `known_last_update` is seen.
+    """
+
+    def __init__(self, *, known_last_update: Optional[str] = None) -> None:
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._data
+
+        self._known_last_update = known_last_update
+        self.last_update: Optional[str] = None
+        self.flights: List[FlightRecord] = []
+
+        self._depth = 0
+        self._record: Optional[Dict[str, Any]] = None
+        self._field: Optional[str] = None
+        self._text: List[str] = []
+        self._flight_ids: Dict[str, str] = {}
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.Parse(chunk, False)
+
+    def close(self) -> Dict[str, Any]:
+        self._parser.Parse(b"", True)
+        return {"lastUpdate": self.last_update, "flights": self.flights}
+
+    def _start(self, name: str, attrs: Dict[str, str]) -> None:
+        self._depth += 1
+        if self._depth == _FLIGHTS_DEPTH and name == "flights":
+            self.last_update = attrs.get("lastUpdate")
+            if self._known_last_update is not None and self.last_update == self._known_last_update:
+                raise FeedUnchanged(self.last_update)
+        elif self._depth == _FLIGHT_DEPTH and name == "flight":
+            self._record = _new_record(attrs.get("uniqueID") or attrs.get("uniqueId"))
+            self._flight_ids = {}
+        elif self._depth == _FIELD_DEPTH and self._record is not None:
+            if name == "status":
+                self._record["status_code"] = attrs.get("code")
+                self._record["status_time"] = attrs.get("time")
+            elif name in _TEXT_FIELDS or name in _FLIGHT_ID_FIELDS:
+                self._field = name
+                self._text = []
+
+    def _end(self, name: str) -> None:
+        if self._depth == _FIELD_DEPTH and self._field is not None:
+            value = "".join(self._text).strip() or None
+            if self._field in _TEXT_FIELDS:
+                self._record[_TEXT_FIELDS[self._field]] = value  # type: ignore[index]
+            elif value:
+                self._flight_ids[self._field] = value
+            self._field = None
+        elif self._depth == _FLIGHT_DEPTH and self._record is not None:
+            self._record["flightId"] = next(
+                (self._flight_ids[key] for key in _FLIGHT_ID_FIELDS if key in self._flight_ids), ""
+            )
+            self.flights.append(FlightRecord(**self._record))
+            self._record = None
+        self._depth -= 1
+
+    def _data(self, text: str) -> None:
+        if self._field is not None:
+            self._text.append(text)
@@ -0,0 +1,223 @@
+"""Microbenchmarks for feed parsing, Airlabs normalization and sensor filtering.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench.py                  # print timings
+    python tests/benchmarks/bench.py --save base.json # keep a baseline
+    python tests/benchmarks/bench.py --compare base.json
+
+Each benchmark reports the median wall time over `--repeat` runs and the
+peak memory allocated by one extra run under `tracemalloc`. With
+`--compare`, the exit status is 1 when any benchmark got slower (or used
+more memory) than the baseline by more than `--tolerance`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+_HERE = Path(__file__).resolve().parent
+for _path in (_HERE, _HERE.parent, _HERE.parent.parent):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import conftest  # noqa: E402,F401  Home Assistant stubs
+
+from custom_components.avinor_flight_data.airlabs import AirlabsApiClient  # noqa: E402
+from custom_components.avinor_flight_data.api import AvinorApiClient  # noqa: E402
+from custom_components.avinor_flight_data.sensor import _apply_flight_type_filter, _compact_flight  # noqa: E402
+
+from fixtures import OSL_FEED_HOURS, airlabs_schedule_rows, osl_feed_xml  # noqa: E402
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    items: int
+    seconds: float
+    peak_kib: float
+
+    @property
+    def per_item_us(self) -> float:
+        return self.seconds / max(self.items, 1) * 1e6
+
+
+class Benchmark(NamedTuple):
+    name: str
+    items: int
+    run: Callable[[], Any]
+
+
+class _Content:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class _Response:
+    status = 200
+    headers: Dict[str, str] = {}
+
+    def __init__(self, body: bytes) -> None:
+        self.content = _Content(body)
+        self._body = body
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def text(self) -> str:
+        return self._body.decode()
+
+    async def __aenter__(self) -> "_Response":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        return False
+
+
+class _Session:
+    """Serves one body for every GET, without any network I/O."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    def get(self, url: str, **kwargs: Any) -> _Response:
+        return _Response(self._body)
+
+
+class _OfflineAirlabsClient(AirlabsApiClient):
+    """Counterparties come from the bundled table; nothing is fetched."""
+
+    def __init__(self) -> None:
+        super().__init__(session=None)
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        raise AssertionError(f"Unexpected Airlabs request: {url}")
+
+
+def build_benchmarks(scale: float = 1.0) -> List[Benchmark]:
+    """Benchmarks over fixtures sized like a 72h OSL feed and a large /schedules page set."""
+    hours = max(int(OSL_FEED_HOURS * scale), 1)
+    feed = osl_feed_xml(hours=hours)
+    rows = airlabs_schedule_rows(count=max(int(4000 * scale), 10))
+    stream_client = AvinorApiClient(_Session(feed), stream_parse=True)
+    tree_client = AvinorApiClient(_Session(feed))
+    airlabs = _OfflineAirlabsClient()
+
+    flights = asyncio.run(stream_client.async_get_flights(airport="OSL"))["flights"]
+
+    return [
+        Benchmark(
+            "avinor_flights_stream",
+            len(flights),
+            lambda: stream_client.async_get_flights(airport="OSL"),
+        ),
+        Benchmark(
+            "avinor_flights_xmltodict",
+            len(flights),
+            lambda: tree_client.async_get_flights(airport="OSL"),
+        ),
+        Benchmark(
+            "airlabs_normalize_schedule_rows",
+            len(rows),
+            lambda: airlabs._normalize_schedule_rows(api_key="k", rows=rows, direction="A", airport="OSL"),
+        ),
+        Benchmark("airlabs_dedupe_schedule_rows", len(rows), lambda: airlabs._dedupe_schedule_rows(rows)),
+        Benchmark("sensor_flight_type_filter", len(flights), lambda: _apply_flight_type_filter(flights, "D")),
+        Benchmark("sensor_compact_flight", len(flights), lambda: [_compact_flight(f) for f in flights]),
+    ]
+
+
+def measure(benchmark: Benchmark, *, repeat: int = 5) -> BenchmarkResult:
+    loop = asyncio.new_event_loop()
+
+    def call() -> Any:
+        result = benchmark.run()
+        if inspect.isawaitable(result):
+            return loop.run_until_complete(result)
+        return result
+
+    try:
+        call()  # warm up caches and lazy imports
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        loop.close()
+    return BenchmarkResult(benchmark.name, benchmark.items, statistics.median(timings), peak / 1024)
+
+
+def run_benchmarks(*, scale: float = 1.0, repeat: int = 5, only: Sequence[str] = ()) -> List[BenchmarkResult]:
+    return [
+        measure(benchmark, repeat=repeat)
+        for benchmark in build_benchmarks(scale)
+        if not only or benchmark.name in only
+    ]
+
+
+def compare(results: Sequence[BenchmarkResult], baseline: Dict[str, Dict[str, float]], *, tolerance: float) -> List[str]:
+    """Describe every benchmark that regressed beyond `tolerance` against `baseline`."""
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        for metric, unit in (("seconds", "s"), ("peak_kib", "KiB")):
+            before, after = base[metric], getattr(result, metric)
+            if before > 0 and after > before * (1 + tolerance):
+                regressions.append(f"{result.name}: {metric} {before:.4g}{unit} -> {after:.4g}{unit}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="fixture size relative to a 72h OSL feed")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", default=(), help="benchmark names to run")
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="fail on regressions against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(scale=args.scale, repeat=args.repeat, only=args.only)
+    print(f"{'benchmark':34} {'items':>6} {'median ms':>10} {'us/item':>8} {'peak KiB':>9}")
+    for result in results:
+        print(
+            f"{result.name:34} {result.items:6d} {result.seconds * 1000:10.2f}"
+            f" {result.per_item_us:8.2f} {result.peak_kib:9.0f}"
+        )
+
+    if args.save:
+        args.save.write_text(
+            json.dumps({r.name: {"seconds": r.seconds, "peak_kib": r.peak_kib} for r in results}, indent=2) + "\n"
+        )
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
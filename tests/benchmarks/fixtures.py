@@ -0,0 +1,128 @@
+"""Synthetic Avinor and Airlabs payloads sized like busy real-world responses.
+
+Generation is deterministic for a given `now`, so runs can be compared.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+# Counterparties that are all in the bundled airport table, so normalization
+# does not need the Airlabs /airports endpoint.
+DOMESTIC_AIRPORTS = ("BGO", "TRD", "SVG", "TOS", "BOO", "AES", "KRS", "HAU", "EVE", "ALF")
+FOREIGN_AIRPORTS = ("CPH", "ARN", "HEL", "AMS", "LHR", "FRA", "CDG", "KEF", "AGP", "ALC", "IST", "DXB")
+AIRLINES = ("SK", "DY", "WF", "KL", "LH", "AY", "BA", "FR", "W6", "TK")
+# Avinor status codes and the Airlabs statuses they map from.
+AVINOR_STATUSES = ("N", "E", "A", "D", "C")
+AIRLABS_STATUSES = ("scheduled", "active", "en-route", "landed", "cancelled")
+
+# OSL peaks around 50 movements an hour; 35 on average over a day.
+OSL_FLIGHTS_PER_HOUR = 35
+OSL_FEED_HOURS = 72
+
+
+def _utc(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def osl_feed_flights(
+    *,
+    hours: int = OSL_FEED_HOURS,
+    hours_before: int = 1,
+    flights_per_hour: int = OSL_FLIGHTS_PER_HOUR,
+    now: datetime | None = None,
+    seed: int = 1,
+) -> List[Dict[str, Any]]:
+    """Flights of an XmlFeed window of `hours`, starting `hours_before` before `now`."""
+    now = now or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    rng = random.Random(seed)
+    start = now - timedelta(hours=hours_before)
+    count = hours * flights_per_hour
+    flights = []
+    for number in range(count):
+        scheduled = start + timedelta(seconds=number * 3600 // flights_per_hour)
+        domestic = rng.random() < 0.55
+        airline = rng.choice(AIRLINES)
+        flight = {
+            "uniqueID": str(9_000_000 + number),
+            "airline": airline,
+            "flight_id": f"{airline}{rng.randint(100, 9999)}",
+            "dom_int": "D" if domestic else rng.choice("SI"),
+            "schedule_time": _utc(scheduled),
+            "arr_dep": "A" if number % 2 else "D",
+            "airport": rng.choice(DOMESTIC_AIRPORTS if domestic else FOREIGN_AIRPORTS),
+        }
+        if flight["arr_dep"] == "D":
+            flight["check_in"] = f"{rng.randint(1, 20)}"
+            flight["gate"] = f"{rng.choice('ABCDEF')}{rng.randint(1, 40)}"
+        if scheduled < now + timedelta(minutes=30):
+            flight["status"] = (rng.choice(AVINOR_STATUSES), _utc(scheduled + timedelta(minutes=rng.randint(-5, 25))))
+        flights.append(flight)
+    return flights
+
+
+def render_feed_xml(flights: List[Dict[str, Any]], *, airport: str = "OSL", last_update: str = "2025-06-01T12:00:00Z") -> bytes:
+    """Serialize flights from `osl_feed_flights` as an Avinor XmlFeed response."""
+    parts = [
+        f'<?xml version="1.0" encoding="utf-8"?>\n<airport name="{airport}">\n',
+        f'  <flights lastUpdate="{last_update}">\n',
+    ]
+    for flight in flights:
+        parts.append(f'    <flight uniqueID="{flight["uniqueID"]}">')
+        for field in ("airline", "flight_id", "dom_int", "schedule_time", "arr_dep", "airport", "check_in", "gate"):
+            if field in flight:
+                parts.append(f"<{field}>{escape(flight[field])}</{field}>")
+        if "status" in flight:
+            code, time = flight["status"]
+            parts.append(f'<status code="{code}" time="{time}"/>')
+        parts.append("</flight>\n")
+    parts.append("  </flights>\n</airport>\n")
+    return "".join(parts).encode()
+
+
+def osl_feed_xml(*, last_update: str = "2025-06-01T12:00:00Z", **kwargs: Any) -> bytes:
+    """An XmlFeed response for OSL (both directions), as served by Avinor."""
+    return render_feed_xml(osl_feed_flights(**kwargs), last_update=last_update)
+
+
+def airlabs_schedule_rows(
+    *,
+    count: int = 4000,
+    airport: str = "OSL",
+    direction: str = "A",
+    codeshare_ratio: float = 0.4,
+    now: datetime | None = None,
+    seed: int = 2,
+) -> List[Dict[str, Any]]:
+    """A large Airlabs /schedules response: `count` rows incl. codeshare duplicates."""
+    now = now or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    rng = random.Random(seed)
+    rows: List[Dict[str, Any]] = []
+    number = 0
+    while len(rows) < count:
+        scheduled = now + timedelta(minutes=2 * number - 60)
+        airline = rng.choice(AIRLINES)
+        other = rng.choice(DOMESTIC_AIRPORTS + FOREIGN_AIRPORTS)
+        dep, arr = (other, airport) if direction == "A" else (airport, other)
+        time_key = "arr_time_utc" if direction == "A" else "dep_time_utc"
+        row = {
+            "flight_iata": f"{airline}{1000 + number}",
+            "flight_icao": f"{airline}X{1000 + number}",
+            "airline_iata": airline,
+            "dep_iata": dep,
+            "arr_iata": arr,
+            time_key: scheduled.strftime("%Y-%m-%d %H:%M"),
+            "status": rng.choice(AIRLABS_STATUSES),
+        }
+        if rng.random() < 0.3:
+            row[time_key.replace("_time_", "_estimated_")] = (scheduled + timedelta(minutes=10)).strftime("%Y-%m-%d %H:%M")
+        rows.append(row)
+        # Marketing carriers list the same flight again under their own number.
+        while rng.random() < codeshare_ratio and len(rows) < count:
+            partner = rng.choice(AIRLINES)
+            rows.append({**row, "flight_iata": f"{partner}{5000 + len(rows)}", "cs_flight_iata": row["flight_iata"]})
+        number += 1
+    return rows
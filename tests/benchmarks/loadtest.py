@@ -0,0 +1,185 @@
+"""Multi-entry load test against the local stand-in servers.
+
+Runs hundreds of `AvinorCoordinator` instances (with the stub Home
+Assistant from `tests/conftest.py`) through the shared client hub, the way
+`async_setup_entry` wires them, and refreshes them all once per cycle.
+Before each cycle the stand-in publishes new data and the response cache
+is cleared, so every cycle is a full poll. From the repository root:
+
+    python tests/benchmarks/loadtest.py --entries 300 --cycles 5 --latency 0.05
+
+Per cycle it reports wall time, CPU time of the event-loop thread (the
+stand-in runs in its own thread and is not counted), event-loop blocking
+(total and longest stall of a 5 ms ticker) and requests per endpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import aiohttp
+
+_HERE = Path(__file__).resolve().parent
+for _path in (_HERE, _HERE.parent, _HERE.parent.parent):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+import conftest  # noqa: E402,F401  Home Assistant stubs
+
+from custom_components.avinor_flight_data.const import UPDATE_INTERVAL_SECONDS  # noqa: E402
+from custom_components.avinor_flight_data.coordinator import AvinorCoordinator  # noqa: E402
+from custom_components.avinor_flight_data.feed import AvinorFeedRegistry  # noqa: E402
+from custom_components.avinor_flight_data.hub import ClientHub  # noqa: E402
+
+from standin import StandInServer  # noqa: E402
+
+AIRPORTS = ("OSL", "BGO", "SVG", "TRD", "TOS", "BOO", "AES", "KRS", "EVE", "HAU", "ALF")
+AIRLABS_API_KEY = "load-test"
+_TICK = 0.005
+
+
+class CycleReport(NamedTuple):
+    cycle: int
+    wall_seconds: float
+    cpu_seconds: float
+    blocked_seconds: float
+    longest_block_seconds: float
+    requests: Dict[str, int]
+    failed: int
+
+
+class LoopMonitor:
+    """Measures event-loop stalls as the overshoot of a short periodic sleep."""
+
+    def __init__(self, tick: float = _TICK) -> None:
+        self._tick = tick
+        self._task: Optional[asyncio.Task] = None
+        self.blocked = 0.0
+        self.longest = 0.0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._tick)
+            lag = loop.time() - start - self._tick
+            if lag > 0:
+                self.blocked += lag
+                self.longest = max(self.longest, lag)
+
+    def __enter__(self) -> "LoopMonitor":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._task.cancel()
+
+
+def entry_confs(entries: int, *, airlabs_ratio: float) -> List[dict]:
+    """Config entries spread over airports and directions, a share of them on Airlabs."""
+    confs = []
+    airlabs_every = round(1 / airlabs_ratio) if airlabs_ratio > 0 else 0
+    for number in range(entries):
+        confs.append(
+            {
+                "airport": AIRPORTS[number % len(AIRPORTS)],
+                "direction": "A" if (number // len(AIRPORTS)) % 2 else "D",
+                "time_from": 1,
+                "time_to": 7 + number % 3,
+                "schedule_source": "airlabs" if airlabs_every and number % airlabs_every == 0 else "avinor",
+                "airlabs_api_key": AIRLABS_API_KEY,
+            }
+        )
+    return confs
+
+
+async def run_load_test(
+    server: StandInServer,
+    *,
+    entries: int = 300,
+    cycles: int = 3,
+    airlabs_ratio: float = 0.1,
+) -> List[CycleReport]:
+    hub = ClientHub(
+        aiohttp.ClientSession(),
+        avinor_base_url=server.avinor_url,
+        airlabs_base_url=server.airlabs_url,
+    )
+    # Feeds go stale right away; the cycles stand in for poll intervals.
+    hub.feeds = AvinorFeedRegistry(hub.avinor, max_age=0)
+    hub.budget.configure(AIRLABS_API_KEY, monthly_quota=10**9)
+
+    coordinators = []
+    for number, conf in enumerate(entry_confs(entries, airlabs_ratio=airlabs_ratio)):
+        airlabs = conf["schedule_source"] == "airlabs"
+        feed = None
+        if not airlabs:
+            feed = hub.feeds.subscribe(
+                f"entry_{number}", airport=conf["airport"], time_from=conf["time_from"], time_to=conf["time_to"]
+            )
+        coordinators.append(
+            AvinorCoordinator(
+                None,
+                hub.avinor,
+                hub.airlabs if airlabs else None,
+                conf,
+                update_interval=timedelta(seconds=UPDATE_INTERVAL_SECONDS),
+                feed=feed,
+                budget=hub.budget,
+            )
+        )
+
+    reports = []
+    try:
+        for cycle in range(1, cycles + 1):
+            server.publish()
+            hub.response_cache.clear()
+            before = Counter(server.requests)
+            with LoopMonitor() as monitor:
+                wall, cpu = time.perf_counter(), time.thread_time()
+                await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+                wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            requests = dict(Counter(server.requests) - before)
+            failed = sum(1 for coordinator in coordinators if coordinator.data.get("lastUpdate") is None)
+            reports.append(CycleReport(cycle, wall, cpu, monitor.blocked, monitor.longest, requests, failed))
+    finally:
+        await hub.async_close()
+    return reports
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=300)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--airlabs-ratio", type=float, default=0.1, help="share of entries on Airlabs")
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in response delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    with StandInServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as server:
+        reports = asyncio.run(
+            run_load_test(server, entries=args.entries, cycles=args.cycles, airlabs_ratio=args.airlabs_ratio)
+        )
+
+    print(f"{args.entries} entries, {args.airlabs_ratio:.0%} on Airlabs, latency {args.latency * 1000:.0f} ms")
+    print(f"{'cycle':>5} {'wall ms':>8} {'cpu ms':>8} {'blocked ms':>10} {'max stall ms':>12} {'failed':>6}  requests")
+    for report in reports:
+        requests = ", ".join(f"{path} {count}" for path, count in sorted(report.requests.items()))
+        print(
+            f"{report.cycle:5d} {report.wall_seconds * 1000:8.1f} {report.cpu_seconds * 1000:8.1f}"
+            f" {report.blocked_seconds * 1000:10.1f} {report.longest_block_seconds * 1000:12.1f}"
+            f" {report.failed:6d}  {requests}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Local stand-in for the Avinor and Airlabs APIs, for offline load testing.
+
+Serves synthetic XmlFeed, airportNames, Airlabs /schedules, /airports and
+/flight responses from `fixtures.py` on 127.0.0.1. The server runs its own
+event loop in a background thread, so its CPU time and latency do not count
+against the client under test. `latency`, `jitter` and `error_rate` can be
+changed while it runs; `publish()` makes every feed report a new
+`lastUpdate`, like a new Avinor publication.
+
+    with StandInServer(latency=0.05) as server:
+        hub = ClientHub(session, avinor_base_url=server.avinor_url, airlabs_base_url=server.airlabs_url)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+import random
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from fixtures import airlabs_schedule_rows, osl_feed_flights, render_feed_xml
+
+# Relative traffic per airport; anything else gets the smallest share.
+AIRPORT_FLIGHTS_PER_HOUR = {"OSL": 35, "BGO": 14, "SVG": 9, "TRD": 9, "TOS": 6, "BOO": 5}
+AIRLABS_PREFIX = "/api/v9"
+
+
+class StandInServer:
+    """Synthetic Avinor and Airlabs endpoints with adjustable latency and errors."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        airlabs_rows: int = 1200,
+        seed: int = 3,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests: Counter[str] = Counter()
+        self.responses: Counter[int] = Counter()
+        self._airlabs_rows = airlabs_rows
+        self._rng = random.Random(seed)
+        self._generation = 0
+        self._now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self._feeds: Dict[Tuple[Any, ...], bytes] = {}
+        self._schedules: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self.port = 0
+
+    @property
+    def avinor_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def airlabs_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{AIRLABS_PREFIX}"
+
+    @property
+    def last_update(self) -> str:
+        return f"{self._now:%Y-%m-%dT%H:%M}:{self._generation % 60:02d}Z"
+
+    def publish(self) -> None:
+        """Start a new publication: feeds change their `lastUpdate` (and ETag)."""
+        self._generation += 1
+
+    def reset_counts(self) -> None:
+        self.requests.clear()
+        self.responses.clear()
+
+    def start(self) -> "StandInServer":
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._async_start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="standin-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    async def _async_start(self) -> None:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/XmlFeed/v1.0", self._xml_feed)
+        app.router.add_get("/airportNames/v1.0", self._airport_names)
+        app.router.add_get(f"{AIRLABS_PREFIX}/schedules", self._schedules_page)
+        app.router.add_get(f"{AIRLABS_PREFIX}/airports", self._airports)
+        app.router.add_get(f"{AIRLABS_PREFIX}/flight", self._flight)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        self.port = self._runner.addresses[0][1]
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests[request.path.removeprefix(AIRLABS_PREFIX)] += 1
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            response: web.StreamResponse = web.Response(status=503, text="injected error")
+        else:
+            response = await handler(request)
+        self.responses[response.status] += 1
+        return response
+
+    async def _xml_feed(self, request: web.Request) -> web.Response:
+        query = request.query
+        airport = query.get("airport", "OSL").upper()
+        direction = query.get("direction", "").upper()
+        time_from, time_to = int(query.get("TimeFrom", 1)), int(query.get("TimeTo", 7))
+        etag = f'"{airport}-{self._generation}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        key = (airport, direction, time_from, time_to, self._generation)
+        body = self._feeds.get(key)
+        if body is None:
+            flights = osl_feed_flights(
+                hours=time_from + time_to,
+                hours_before=time_from,
+                flights_per_hour=AIRPORT_FLIGHTS_PER_HOUR.get(airport, 3),
+                now=self._now,
+                seed=zlib.crc32(airport.encode()),
+            )
+            if direction:
+                flights = [flight for flight in flights if flight["arr_dep"] == direction]
+            body = self._feeds[key] = render_feed_xml(flights, airport=airport, last_update=self.last_update)
+        return web.Response(body=body, content_type="application/xml", headers={"ETag": etag})
+
+    async def _airport_names(self, request: web.Request) -> web.Response:
+        from custom_components.avinor_flight_data.airport_table import lookup_airport
+
+        items = "".join(
+            f'<airportName code="{code}" name="{lookup_airport(code)["name"]}"/>'
+            for code in ("AES", "ALF", "BGO", "BOO", "EVE", "HAU", "KRS", "OSL", "SVG", "TOS", "TRD")
+        )
+        return web.Response(text=f"<airportNames>{items}</airportNames>", content_type="application/xml")
+
+    async def _schedules_page(self, request: web.Request) -> web.Response:
+        query = request.query
+        direction = "D" if "dep_iata" in query else "A"
+        airport = (query.get("dep_iata") or query.get("arr_iata") or "OSL").upper()
+        rows = self._schedules.get((airport, direction))
+        if rows is None:
+            rows = self._schedules[(airport, direction)] = airlabs_schedule_rows(
+                count=self._airlabs_rows, airport=airport, direction=direction, now=self._now
+            )
+        offset, limit = int(query.get("offset", 0)), int(query.get("limit", 100))
+        return web.json_response({"response": rows[offset : offset + limit]})
+
+    async def _airports(self, request: web.Request) -> web.Response:
+        from custom_components.avinor_flight_data.airport_table import lookup_airport
+
+        code = request.query.get("iata_code", "").upper()
+        meta = lookup_airport(code) or {"iata_code": code, "country_code": "US", "name": f"{code} Airport"}
+        return web.json_response({"response": [meta]})
+
+    async def _flight(self, request: web.Request) -> web.Response:
+        query = request.query
+        flight = query.get("flight_iata") or query.get("flight_icao") or query.get("flight_number") or ""
+        return web.json_response(
+            {"response": {"flight_iata": flight, "status": "en-route", "dep_iata": "OSL", "arr_iata": "CPH", "delayed": 5}}
+        )
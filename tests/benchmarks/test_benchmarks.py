@@ -0,0 +1,23 @@
+from bench import build_benchmarks, compare, run_benchmarks
+from fixtures import airlabs_schedule_rows, osl_feed_flights
+
+
+def test_fixtures_are_sized_like_busy_feeds():
+    assert len(osl_feed_flights()) == 72 * 35
+    rows = airlabs_schedule_rows()
+    assert len(rows) == 4000
+    # Codeshare duplicates make up a good share of the rows, as on Airlabs.
+    assert len({row.get("cs_flight_iata") or row["flight_iata"] for row in rows}) < 3000
+
+
+def test_benchmarks_run_and_detect_regressions():
+    # Smoke run on small fixtures; the full suite runs via `python tests/benchmarks/bench.py`.
+    results = run_benchmarks(scale=0.05, repeat=1)
+
+    assert [r.name for r in results] == [b.name for b in build_benchmarks(0.05)]
+    assert all(r.items > 0 and r.seconds > 0 and r.peak_kib > 0 for r in results)
+
+    baseline = {r.name: {"seconds": r.seconds, "peak_kib": r.peak_kib} for r in results}
+    assert compare(results, baseline, tolerance=0.25) == []
+    slower = {name: {"seconds": m["seconds"] / 2, "peak_kib": m["peak_kib"]} for name, m in baseline.items()}
+    assert len(compare(results, slower, tolerance=0.25)) == len(results)
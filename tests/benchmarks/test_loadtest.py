@@ -0,0 +1,49 @@
+import aiohttp
+import pytest
+
+from custom_components.avinor_flight_data.hub import ClientHub
+
+from loadtest import AIRPORTS, run_load_test
+from standin import StandInServer
+
+
+@pytest.mark.asyncio
+async def test_standin_serves_every_endpoint_and_injects_errors():
+    with StandInServer() as server:
+        hub = ClientHub(aiohttp.ClientSession(), avinor_base_url=server.avinor_url, airlabs_base_url=server.airlabs_url)
+        try:
+            airports = await hub.avinor.async_get_airports()
+            assert {"iata": "OSL", "name": "Oslo Airport"} in airports
+
+            flights = await hub.avinor.async_get_flights(airport="BGO", time_from=1, time_to=7)
+            assert len(flights["flights"]) == 8 * 14
+            # Same publication: past the response cache, the conditional request gets a 304.
+            hub.response_cache.clear()
+            unchanged = await hub.avinor.async_get_flights(
+                airport="BGO", time_from=1, time_to=7, known_last_update=flights["lastUpdate"]
+            )
+            assert unchanged is None
+            assert server.responses[304] == 1
+
+            details = await hub.airlabs.async_get_flight_details(api_key="k", flight_iata="SK4035")
+            assert details["flight_iata"] == "SK4035"
+
+            server.error_rate = 1.0
+            with pytest.raises(Exception):
+                await hub.avinor.async_get_flights(airport="TRD")
+            assert server.responses[503] == 1
+        finally:
+            await hub.async_close()
+
+
+@pytest.mark.asyncio
+async def test_load_test_shares_one_feed_download_per_airport():
+    with StandInServer() as server:
+        reports = await run_load_test(server, entries=44, cycles=2, airlabs_ratio=0.1)
+
+    assert [report.cycle for report in reports] == [1, 2]
+    for report in reports:
+        assert report.failed == 0
+        assert report.requests["/XmlFeed/v1.0"] == len(AIRPORTS)
+        assert report.requests["/schedules"] > 0
+        assert report.cpu_seconds > 0 and report.wall_seconds >= report.longest_block_seconds
@@ -6,6 +6,8 @@ For these repository-local unit tests, we only need those imports to succeed.
 
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timezone
 import sys
 import types
 
@@ -39,8 +41,11 @@ ha_helpers = _ensure_module("homeassistant.helpers")
 ha_helpers_aiohttp = _ensure_module("homeassistant.helpers.aiohttp_client")
 ha_helpers_device_registry = _ensure_module("homeassistant.helpers.device_registry")
 ha_helpers_entity_platform = _ensure_module("homeassistant.helpers.entity_platform")
+ha_helpers_event = _ensure_module("homeassistant.helpers.event")
 ha_helpers_update_coordinator = _ensure_module("homeassistant.helpers.update_coordinator")
 ha_helpers_selector = _ensure_module("homeassistant.helpers.selector")
+ha_helpers_storage = _ensure_module("homeassistant.helpers.storage")
+ha_const = _ensure_module("homeassistant.const")
 
 
 # Minimal symbols referenced at import-time
@@ -68,7 +73,11 @@ class _DataUpdateCoordinator:  # noqa: D101
         return cls
 
     def __init__(self, *args, **kwargs):
-        pass
+        self.update_interval = kwargs.get("update_interval")
+        self.data = None
+
+    async def async_refresh(self):
+        self.data = await self._async_update_data()
 
 
 class _CoordinatorEntity:  # noqa: D101
@@ -85,6 +94,7 @@ class _SensorEntity:  # noqa: D101
 
 ha_config_entries.ConfigEntry = _ConfigEntry
 ha_core.HomeAssistant = _HomeAssistant
+ha_core.callback = lambda func: func
 ha_core.SupportsResponse = types.SimpleNamespace(ONLY="only")
 ha_data_entry_flow.FlowResult = object
 
@@ -108,6 +118,35 @@ ha_helpers_entity_platform.AddEntitiesCallback = object
 # Used by config flow; not executed in these tests but safe to stub.
 ha_helpers_aiohttp.async_get_clientsession = lambda hass: None
 
+
+def _async_call_later(hass, delay, action):  # noqa: ANN001
+    handle = asyncio.get_running_loop().call_later(delay, lambda: action(datetime.now(timezone.utc)))
+    return handle.cancel
+
+
+ha_helpers_event.async_call_later = _async_call_later
+
+
+class _Store:  # noqa: D101
+    def __init__(self, hass, version, key, *args, **kwargs):  # noqa: ANN001
+        self.key = key
+        self.data = None
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data):  # noqa: ANN001
+        self.data = data
+
+    def async_delay_save(self, data_func, delay=0):  # noqa: ANN001
+        self.data = data_func()
+
+    async def async_remove(self):
+        self.data = None
+
+
+ha_helpers_storage.Store = _Store
+
 # Selector helpers (optional in the integration)
 ha_helpers_selector.selector = lambda x: x
 ha_helpers_selector.SelectSelector = object
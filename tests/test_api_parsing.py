@@ -4,7 +4,7 @@ from types import SimpleNamespace
 import pytest
 
 from custom_components.avinor_flight_data.api import AvinorApiClient
-from custom_components.avinor_flight_data.api import AirlabsApiClient
+from custom_components.avinor_flight_data.airlabs import AirlabsApiClient
 from custom_components.avinor_flight_data.sensor import (
     AvinorFlightsSensor,
     _apply_flight_type_filter,
@@ -14,7 +14,7 @@ from custom_components.avinor_flight_data.sensor import (
 
 class StubClient(AvinorApiClient):
     def __init__(self, flights_payload, airports_payload):
-        # don't call super; we won't use the aiohttp session in tests
+        super().__init__(None)
         self._flights_payload = flights_payload
         self._airports_payload = airports_payload
 
@@ -349,3 +349,298 @@ async def test_airlabs_get_schedules_for_departures_uses_arrival_airport_for_typ
     assert result["flights"][0]["airport"] == "London Gatwick Airport"
     assert result["flights"][0]["dom_int"] == "I"
     assert result["flights"][0]["arr_dep"] == "D"
+
+
+FLIGHTS_XML = b"""<?xml version="1.0" encoding="utf-8"?>
+<airport name="OSL">
+  <flights lastUpdate="2025-01-01T12:00:00Z">
+    <flight uniqueID="u1">
+      <airline>DY</airline>
+      <flight_id>DY123</flight_id>
+      <dom_int>D</dom_int>
+      <schedule_time>2025-01-01T13:00:00Z</schedule_time>
+      <arr_dep>D</arr_dep>
+      <airport>BGO</airport>
+      <check_in>1</check_in>
+      <gate>A12</gate>
+      <status code="BRD" time="2025-01-01T12:40:00Z"/>
+    </flight>
+    <flight uniqueID="u2">
+      <airline>SK</airline>
+      <flight_id>SK456</flight_id>
+      <dom_int>I</dom_int>
+      <schedule_time>2025-01-01T14:00:00Z</schedule_time>
+      <arr_dep>A</arr_dep>
+      <airport>CPH</airport>
+      <via_airport>GOT</via_airport>
+      <gate/>
+    </flight>
+  </flights>
+</airport>
+"""
+
+
+@pytest.mark.asyncio
+async def test_stream_parser_matches_tree_parsing():
+    import xmltodict
+
+    from custom_components.avinor_flight_data.xmlfeed import AvinorFlightStreamParser
+
+    tree_client = StubClient(xmltodict.parse(FLIGHTS_XML), {})
+    expected = await tree_client.async_get_flights(airport="OSL")
+
+    parser = AvinorFlightStreamParser()
+    for i in range(0, len(FLIGHTS_XML), 7):
+        parser.feed(FLIGHTS_XML[i : i + 7])
+    streamed = parser.close()
+
+    assert streamed == expected
+    assert [flight["uniqueId"] for flight in streamed["flights"]] == ["u1", "u2"]
+    assert streamed["flights"][1]["gate"] is None
+    assert streamed["flights"][0]["status_time"] == "2025-01-01T12:40:00Z"
+
+
+def test_stream_parser_stops_at_known_last_update():
+    from custom_components.avinor_flight_data.xmlfeed import AvinorFlightStreamParser, FeedUnchanged
+
+    parser = AvinorFlightStreamParser(known_last_update="2025-01-01T12:00:00Z")
+    with pytest.raises(FeedUnchanged):
+        parser.feed(FLIGHTS_XML[:200])
+    assert parser.flights == []
+
+
+def test_sensor_skips_state_write_when_its_slice_is_unchanged():
+    from custom_components.avinor_flight_data.models import FlightRecord, diff_flights
+
+    domestic = FlightRecord(uniqueId="u1", flightId="SK1", dom_int="D")
+    international = FlightRecord(uniqueId="u2", flightId="SK2", dom_int="I")
+    sensor = object.__new__(AvinorFlightsSensor)
+    sensor._entry = SimpleNamespace(data={"airport": "OSL", "direction": "A", "flight_type": "D"}, options={})
+
+    first = [domestic, international]
+    sensor.coordinator = SimpleNamespace(data={"flights": first, "delta": diff_flights(None, first)})
+    assert sensor._slice_changed()
+    assert not sensor._slice_changed()
+
+    second = [domestic, international.replace(gate="B2")]
+    sensor.coordinator = SimpleNamespace(data={"flights": second, "delta": diff_flights(first, second)})
+    assert not sensor._slice_changed()
+
+    third = [domestic.replace(gate="A1"), international]
+    sensor.coordinator = SimpleNamespace(data={"flights": third, "delta": diff_flights(second, third)})
+    assert sensor._slice_changed()
+
+
+def test_sensor_writes_state_when_only_the_feed_timestamp_moves():
+    from custom_components.avinor_flight_data.models import FlightRecord, diff_flights
+
+    flights = [FlightRecord(uniqueId="u1", flightId="SK1", dom_int="D")]
+    sensor = object.__new__(AvinorFlightsSensor)
+    sensor._entry = SimpleNamespace(data={"airport": "OSL", "direction": "A", "flight_type": "D"}, options={})
+
+    sensor.coordinator = SimpleNamespace(
+        data={"lastUpdate": "2025-01-01T12:00:00Z", "flights": flights, "delta": diff_flights(None, flights)}
+    )
+    assert sensor._slice_changed()
+
+    sensor.coordinator = SimpleNamespace(
+        data={"lastUpdate": "2025-01-01T12:00:00Z", "flights": flights, "delta": diff_flights(flights, flights)}
+    )
+    assert not sensor._slice_changed()
+
+    sensor.coordinator = SimpleNamespace(
+        data={"lastUpdate": "2025-01-01T12:03:00Z", "flights": flights, "delta": diff_flights(flights, flights)}
+    )
+    assert sensor._slice_changed()
+    assert sensor.extra_state_attributes["last_update"] == "2025-01-01T12:03:00Z"
+
+
+def test_sensor_attribute_profiles_bound_the_flights_attribute():
+    flights = [{"flightId": f"SK{i}", "dom_int": "D"} for i in range(40)]
+    coordinator = SimpleNamespace(data={"lastUpdate": "2025-01-01T12:00:00Z", "flights": flights})
+
+    def attributes(profile):
+        sensor = object.__new__(AvinorFlightsSensor)
+        sensor.coordinator = coordinator
+        sensor._entry = SimpleNamespace(
+            data={"airport": "OSL", "direction": "A", "flight_type": ""},
+            options={"attribute_profile": profile},
+        )
+        return sensor.extra_state_attributes
+
+    assert len(attributes("full")["flights"]) == 40
+    assert len(attributes("full_unrecorded")["flights"]) == 40
+    assert len(attributes("capped")["flights"]) == 25
+    assert "flights" not in attributes("summary")
+    assert len(attributes("summary")["flights_summary"]) == 10
+
+
+def test_sensor_view_is_computed_once_per_coordinator_update():
+    flights = [{"flightId": "SK1", "dom_int": "D"}, {"flightId": "SK2", "dom_int": "I"}]
+    sensor = object.__new__(AvinorFlightsSensor)
+    sensor.coordinator = SimpleNamespace(data={"lastUpdate": None, "flights": flights})
+    sensor._entry = SimpleNamespace(data={"airport": "OSL", "direction": "A", "flight_type": "D"}, options={})
+
+    attributes = sensor.extra_state_attributes
+    assert sensor.native_value == 1
+    assert sensor.extra_state_attributes is attributes
+
+    sensor.coordinator.data = {"lastUpdate": None, "flights": flights + [{"flightId": "SK3", "dom_int": "D"}]}
+    assert sensor.native_value == 2
+    assert sensor.extra_state_attributes is not attributes
+
+
+@pytest.mark.asyncio
+async def test_airlabs_airport_lookups_are_concurrent_bounded_and_coalesced():
+    in_flight = 0
+    peak = 0
+    requested = []
+
+    class SlowAirportsClient(AirlabsApiClient):
+        async def _get_json(self, url, params=None):
+            nonlocal in_flight, peak
+            requested.append(params["iata_code"])
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"response": [{"iata_code": params["iata_code"], "country_code": "SE"}]}
+
+    client = SlowAirportsClient(session=None, airport_lookup_concurrency=3)
+    codes = ["ARN", "GOT", "MMX", "LLA", "UME", "ARN", "GOT"]
+    results = await asyncio.gather(*(client.async_get_airport(api_key="k", iata_code=c) for c in codes))
+
+    assert [r["iata_code"] for r in results] == codes
+    assert sorted(requested) == ["ARN", "GOT", "LLA", "MMX", "UME"]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_airlabs_schedules_use_bundled_airport_table_before_remote_lookup():
+    now = datetime.now(timezone.utc)
+    arr_time = (now + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M")
+    airport_requests = []
+
+    def payload(url, params):
+        if url.endswith("/schedules"):
+            return {
+                "response": [
+                    {"flight_iata": "SK1", "dep_iata": "ARN", "arr_iata": "OSL", "arr_time_utc": arr_time},
+                    {"flight_iata": "XX2", "dep_iata": "ZZZ", "arr_iata": "OSL", "arr_time_utc": arr_time},
+                ]
+            }
+        if url.endswith("/airports"):
+            airport_requests.append(params["iata_code"])
+            return {"response": [{"iata_code": "ZZZ", "country_code": "US", "name": "Somewhere Airport"}]}
+        raise AssertionError(f"Unexpected URL: {url}")
+
+    client = StubAirlabsClient(payload)
+    result = await client.async_get_schedules(api_key="k", airport="OSL", direction="A", time_from=1, time_to=2)
+
+    assert airport_requests == ["ZZZ"]
+    assert [f["dom_int"] for f in result["flights"]] == ["S", "I"]
+    assert result["flights"][0]["airport"] == "Stockholm Arlanda Airport"
+
+
+# Airports operated by Avinor.
+AVINOR_AIRPORTS = (
+    "AES", "ALF", "ANX", "BDU", "BGO", "BJF", "BNN", "BOO", "BVG", "EVE", "FDE",
+    "FRO", "HAA", "HAU", "HFT", "HOV", "HVG", "KKN", "KRS", "KSU", "LKL", "LKN",
+    "LYR", "MEH", "MJF", "MOL", "MQN", "OSL", "OSY", "RET", "RRS", "RVK", "SDN",
+    "SKN", "SOG", "SOJ", "SSJ", "SVG", "SVJ", "TOS", "TRD", "VAW", "VDS",
+)
+
+
+def test_bundled_airport_table_covers_every_avinor_airport():
+    from custom_components.avinor_flight_data.airport_table import lookup_airport
+
+    missing = [code for code in AVINOR_AIRPORTS if lookup_airport(code) is None]
+    assert missing == []
+    assert {lookup_airport(code)["country_code"] for code in AVINOR_AIRPORTS} == {"NO"}
+
+
+@pytest.mark.asyncio
+async def test_airlabs_schedules_paginate_until_past_window():
+    now = datetime.now(timezone.utc)
+    offsets = []
+
+    def page(offset):
+        # 50 rows per page, one every 10 minutes from now.
+        return [
+            {
+                "flight_iata": f"SK{offset + i}",
+                "dep_iata": "CPH",
+                "arr_iata": "OSL",
+                "arr_time_utc": (now + timedelta(minutes=10 * (offset + i) + 1)).strftime("%Y-%m-%d %H:%M"),
+            }
+            for i in range(50)
+        ]
+
+    def payload(url, params):
+        offsets.append(params.get("offset", 0))
+        return {"response": page(params.get("offset", 0))}
+
+    client = StubAirlabsClient(payload)
+    client._schedules_parallel_pages = 2
+    result = await client.async_get_schedules(api_key="k", airport="OSL", direction="A", time_from=0, time_to=12)
+
+    # 12h window = 72 rows; page 2 (offset 50) already ends past the window.
+    assert offsets == [0, 50, 100]
+    assert len(result["flights"]) == 72
+
+
+@pytest.mark.asyncio
+async def test_airlabs_schedules_warn_when_the_page_limit_truncates(caplog):
+    now = datetime.now(timezone.utc)
+
+    def payload(url, params):
+        # One arrival a minute: a 24h window needs far more pages than allowed.
+        offset = params.get("offset", 0)
+        return {
+            "response": [
+                {
+                    "flight_iata": f"SK{offset + i}",
+                    "dep_iata": "CPH",
+                    "arr_iata": "OSL",
+                    "arr_time_utc": (now + timedelta(minutes=offset + i + 1)).strftime("%Y-%m-%d %H:%M"),
+                }
+                for i in range(50)
+            ]
+        }
+
+    client = StubAirlabsClient(payload)
+    result = await client.async_get_schedules(api_key="k", airport="OSL", direction="A", time_from=0, time_to=24)
+
+    assert len(result["flights"]) == 500
+    assert "stopped at the 10-page limit" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_airlabs_flight_details_batch_is_keyed_and_bounded():
+    active = 0
+    peak = 0
+    requested = []
+
+    class BatchClient(AirlabsApiClient):
+        def __init__(self):
+            super().__init__(session=None)
+
+        async def _get_json(self, url, params=None):
+            nonlocal active, peak
+            requested.append(params.get("flight_iata") or params.get("flight_icao"))
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if params.get("flight_iata") == "XX999":
+                return {"error": {"message": "Flight not found"}}
+            return {"response": {"flight": params.get("flight_iata") or params.get("flight_icao")}}
+
+    flights = ["DY1", "DY2", "DY1", {"flight_icao": "NAX3"}, "DY4", "XX999"]
+    result = await BatchClient().async_get_many_flight_details(api_key="k", flights=flights, concurrency=2)
+
+    assert list(result) == ["DY1", "DY2", "NAX3", "DY4", "XX999"]
+    assert result["NAX3"] == {"flight": "NAX3"}
+    assert result["XX999"]["error"].startswith("Airlabs API error")
+    assert sorted(requested) == ["DY1", "DY2", "DY4", "NAX3", "XX999"]
+    assert peak == 2
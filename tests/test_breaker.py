@@ -0,0 +1,91 @@
+import aiohttp
+import pytest
+
+from custom_components.avinor_flight_data import breaker as breaker_module
+from custom_components.avinor_flight_data.api import AvinorApiClient
+from custom_components.avinor_flight_data.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+
+
+class DownSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise aiohttp.ClientConnectionError("connection refused")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def _fail(breaker):
+    with pytest.raises(aiohttp.ClientConnectionError):
+        with breaker.guard():
+            raise aiohttp.ClientConnectionError("down")
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_for_every_client():
+    session = DownSession()
+    breakers = CircuitBreakerRegistry()
+    clients = [AvinorApiClient(session, breakers=breakers) for _ in range(2)]
+
+    for _ in range(3):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await clients[0].async_get_flights(airport="OSL")
+    assert session.calls == 3
+
+    with pytest.raises(CircuitOpenError):
+        await clients[1].async_get_flights(airport="BGO")
+    assert session.calls == 3
+    assert breakers.get("asrv.avinor.no").state == STATE_OPEN
+
+
+def test_breaker_probes_once_and_backs_off_exponentially(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(breaker_module.random, "uniform", lambda low, high: 1.0)
+    breaker = CircuitBreaker("example.test", failure_threshold=2, base_backoff=30, max_backoff=100)
+
+    _fail(breaker)
+    assert breaker.state == STATE_CLOSED
+    _fail(breaker)
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in == 30
+
+    clock.now += 30
+    with breaker.guard():
+        assert breaker.state == STATE_HALF_OPEN
+        # Only one probe at a time.
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+    assert breaker.state == STATE_CLOSED
+
+    _fail(breaker)
+    _fail(breaker)
+    clock.now += 30
+    _fail(breaker)  # failed probe doubles the backoff
+    assert breaker.retry_in == 60
+    clock.now += 60
+    _fail(breaker)
+    assert breaker.retry_in == 100  # capped
+
+    # A client error means the host answered: the circuit closes.
+    clock.now += 100
+    with pytest.raises(ValueError):
+        with breaker.guard():
+            raise ValueError("bad payload")
+    assert breaker.state == STATE_CLOSED
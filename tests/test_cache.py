@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+import time
+
+import pytest
+
+from custom_components.avinor_flight_data.airlabs import AirlabsApiClient
+from custom_components.avinor_flight_data.cache import AirportMetadataCache, ResponseCache
+from custom_components.avinor_flight_data.const import ADAPTIVE_FAST_INTERVAL_SECONDS
+
+from conftest import _Store
+
+
+@pytest.mark.asyncio
+async def test_airport_cache_persists_and_expires(monkeypatch):
+    store = _Store(None, 1, "avinor_flight_data.airport_cache")
+    cache = AirportMetadataCache(store=store, ttl=60, max_entries=2)
+    cache["CPH"] = {"country_code": "DK"}
+    cache["ARN"] = {"country_code": "SE"}
+    cache.get("CPH")
+    cache["OSL"] = {"country_code": "NO"}
+
+    # ARN was least recently used and is evicted at the size bound.
+    assert cache.get("ARN") is None
+    assert set(store.data["airports"]) == {"CPH", "OSL"}
+
+    reloaded = AirportMetadataCache(store=store, ttl=60, max_entries=2)
+    await reloaded.async_load()
+    assert reloaded.get("CPH") == {"country_code": "DK"}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert reloaded.get("CPH") is None
+
+
+class QuotaExhaustedAirlabsClient(AirlabsApiClient):
+    def __init__(self, airport_cache):
+        super().__init__(session=None, airport_cache=airport_cache)
+        self.calls = 0
+
+    async def _get_json(self, url, params=None):
+        self.calls += 1
+        return {"error": {"code": "month_limit_exceeded", "message": "Monthly limit exceeded"}}
+
+
+@pytest.mark.asyncio
+async def test_failed_airport_lookups_are_not_persisted():
+    store = _Store(None, 1, "avinor_flight_data.airport_cache")
+    store.data = {"airports": {"ABC": {"ts": time.time(), "data": {}}}}
+    cache = AirportMetadataCache(store=store)
+    await cache.async_load()
+    # An empty entry left by an older version is looked up again.
+    assert cache.get("ABC") is None
+
+    client = QuotaExhaustedAirlabsClient(cache)
+    assert await client.async_get_airport(api_key="key", iata_code="XYZ") == {}
+    assert await client.async_get_airport(api_key="key", iata_code="XYZ") == {}
+
+    assert client.calls == 2
+    assert "XYZ" not in cache
+    assert "XYZ" not in (store.data or {}).get("airports", {})
+
+
+class ErrorThenOkAirlabsClient(AirlabsApiClient):
+    def __init__(self, response_cache):
+        super().__init__(session=None, response_cache=response_cache)
+        self.calls = 0
+
+    async def _get_json(self, url, params=None):
+        self.calls += 1
+        if self.calls == 1:
+            return {"error": {"message": "temporarily unavailable"}}
+        return {"response": {"flight_iata": params["flight_iata"]}}
+
+
+def test_response_cache_ttl_lru_and_counters(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    cache = ResponseCache(ttls={"/XmlFeed/v1.0": 45, "/flight": 60}, max_entries=2)
+
+    assert cache.ttl_for("https://asrv.avinor.no/XmlFeed/v1.0") == 45
+    assert cache.ttl_for("https://airlabs.co/api/v9/flight") == 60
+    assert cache.ttl_for("https://airlabs.co/api/v9/routes") == 0
+
+    # The API key never ends up in the key; param order does not matter.
+    key = cache.key("json", "https://airlabs.co/api/v9/flight", {"flight_iata": "DY1", "api_key": "secret"})
+    assert key == cache.key("json", "https://airlabs.co/api/v9/flight/", {"api_key": "other", "flight_iata": "DY1"})
+    assert "secret" not in repr(key)
+
+    cache.set("a", 1, ttl=45)
+    cache.set("b", 2, ttl=45)
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=45)
+    assert cache.get("b") is None  # least recently used
+    clock[0] += 46
+    assert cache.get("a") is None  # expired
+    assert cache.stats == {"entries": 1, "hits": 1, "misses": 2, "evictions": 1}
+
+
+@pytest.mark.asyncio
+async def test_clients_share_cached_responses_but_not_errors():
+    response_cache = ResponseCache()
+    first = ErrorThenOkAirlabsClient(response_cache)
+
+    with pytest.raises(RuntimeError):
+        await first.async_get_flight_details(api_key="key", flight_iata="DY123")
+    assert await first.async_get_flight_details(api_key="key", flight_iata="DY123") == {"flight_iata": "DY123"}
+
+    second = ErrorThenOkAirlabsClient(response_cache)
+    assert await second.async_get_flight_details(api_key="key", flight_iata="DY123") == {"flight_iata": "DY123"}
+    assert (first.calls, second.calls) == (2, 0)
+    assert response_cache.hits == 1
+
+
+class ScheduleAirlabsClient(AirlabsApiClient):
+    def __init__(self, response_cache):
+        super().__init__(session=None, response_cache=response_cache)
+        self.calls = 0
+
+    async def _get_json(self, url, params=None):
+        self.calls += 1
+        arr_time = (datetime.now(timezone.utc) + timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M")
+        return {"response": [{"flight_iata": "SK1", "dep_iata": "CPH", "arr_iata": "OSL", "arr_time_utc": arr_time}]}
+
+
+@pytest.mark.asyncio
+async def test_cached_schedules_keep_their_fetch_time(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    client = ScheduleAirlabsClient(ResponseCache())
+    schedules = dict(api_key="key", airport="OSL", direction="A", time_from=0, time_to=2)
+
+    first = await client.async_get_schedules(**schedules)
+    again = await client.async_get_schedules(**schedules)
+    # Served from the cache: not presented as newer than it is.
+    assert client.calls == 1
+    assert again["lastUpdate"] == first["lastUpdate"]
+
+    # Expired before the fastest poll interval comes round.
+    clock[0] += ADAPTIVE_FAST_INTERVAL_SECONDS
+    refreshed = await client.async_get_schedules(**schedules)
+    assert client.calls == 2
+    assert refreshed["lastUpdate"] > first["lastUpdate"]
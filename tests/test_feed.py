@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.avinor_flight_data import feed as feed_module
+from custom_components.avinor_flight_data.coordinator import AvinorCoordinator
+from custom_components.avinor_flight_data.feed import AvinorAirportFeed, AvinorFeedRegistry, slice_flights
+
+
+class CountingApi:
+    def __init__(self, payload):
+        self._payload = payload
+        self.calls = []
+
+    async def async_get_flights(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(0)
+        if kwargs.get("known_last_update") == self._payload["lastUpdate"]:
+            return None
+        return self._payload
+
+
+def _flight(flight_id, arr_dep, schedule_time):
+    return {"flightId": flight_id, "arr_dep": arr_dep, "schedule_time": schedule_time}
+
+
+@pytest.mark.asyncio
+async def test_entries_for_same_airport_share_one_fetch():
+    api = CountingApi({"lastUpdate": "2025-01-01T12:00:00Z", "flights": []})
+    registry = AvinorFeedRegistry(api)
+
+    arrivals = registry.subscribe("entry_a", airport="osl", time_from=1, time_to=7)
+    departures = registry.subscribe("entry_d", airport="OSL", time_from=2, time_to=4)
+    assert arrivals is departures
+
+    await asyncio.gather(arrivals.async_get(), departures.async_get())
+    await arrivals.async_get()
+
+    assert len(api.calls) == 1
+    assert api.calls[0] == {"airport": "OSL", "time_from": 2, "time_to": 7, "known_last_update": None}
+
+    registry.unsubscribe("entry_a", airport="OSL")
+    registry.unsubscribe("entry_d", airport="OSL")
+    assert registry.subscribe("entry_a", airport="OSL", time_from=1, time_to=7) is not arrivals
+
+
+def test_slice_flights_filters_direction_and_window():
+    now = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    data = {
+        "lastUpdate": "2025-01-01T11:59:00Z",
+        "flights": [
+            _flight("A1", "A", "2025-01-01T13:00:00Z"),
+            _flight("D1", "D", "2025-01-01T13:00:00Z"),
+            _flight("A2", "A", "2025-01-01T10:30:00Z"),
+            _flight("A3", "A", "2025-01-01T20:00:00Z"),
+            _flight("A4", "A", None),
+        ],
+    }
+
+    sliced = slice_flights(data, direction="A", time_from=1, time_to=7, now=now)
+
+    assert sliced["lastUpdate"] == "2025-01-01T11:59:00Z"
+    assert [f["flightId"] for f in sliced["flights"]] == ["A1", "A4"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_feed_keeps_coordinator_data():
+    api = CountingApi({"lastUpdate": "2025-01-01T12:00:00Z", "flights": [_flight("A1", "A", None)]})
+    feed = AvinorAirportFeed(api, "OSL", max_age=0)
+    feed.subscribe("entry", time_from=1, time_to=7)
+    coordinator = AvinorCoordinator(
+        None,
+        api,
+        None,
+        {"airport": "OSL", "direction": "A", "time_from": 1, "time_to": 7},
+        update_interval=None,
+        feed=feed,
+    )
+
+    first = await coordinator._async_update_data()
+    second = await coordinator._async_update_data()
+
+    assert second is first
+    assert [call["known_last_update"] for call in api.calls] == [None, "2025-01-01T12:00:00Z"]
+
+
+@pytest.mark.asyncio
+async def test_unset_windows_leave_the_server_defaults():
+    api = CountingApi({"lastUpdate": "2025-01-01T12:00:00Z", "flights": []})
+    feed = AvinorAirportFeed(api, "OSL")
+    feed.subscribe("entry_a", time_from=None, time_to=None)
+
+    await feed.async_get()
+    assert api.calls[0] == {"airport": "OSL", "time_from": None, "time_to": None, "known_last_update": None}
+
+    # Another entry asks for less than the defaults (1h back, 7h ahead): still covered.
+    feed.subscribe("entry_d", time_from=0, time_to=3)
+    await feed.async_get()
+    assert len(api.calls) == 1
+
+    now = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    flights = [_flight("A1", "A", "2025-01-01T11:30:00Z"), _flight("A2", "A", "2025-01-01T18:00:00Z")]
+    data = {"lastUpdate": None, "flights": flights}
+    sliced = slice_flights(data, direction="A", time_from=None, time_to=None, now=now)
+    assert [f["flightId"] for f in sliced["flights"]] == ["A1", "A2"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_feed_is_sliced_again_as_the_window_moves(monkeypatch):
+    soon = (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat().replace("+00:00", "Z")
+    past = (datetime.now(timezone.utc) - timedelta(minutes=30)).isoformat().replace("+00:00", "Z")
+    api = CountingApi({"lastUpdate": "2025-01-01T12:00:00Z", "flights": [_flight("A1", "A", soon), _flight("A2", "A", past)]})
+    feed = AvinorAirportFeed(api, "OSL", max_age=0)
+    feed.subscribe("entry", time_from=1, time_to=7)
+    coordinator = AvinorCoordinator(
+        None,
+        api,
+        None,
+        {"airport": "OSL", "direction": "A", "time_from": 1, "time_to": 7},
+        update_interval=None,
+        feed=feed,
+    )
+
+    first = await coordinator._async_update_data()
+    assert [f["flightId"] for f in first["flights"]] == ["A1", "A2"]
+
+    # An hour later, with no new publication, A2 has left the window.
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+    clock = SimpleNamespace(now=lambda tz=None: later, fromisoformat=datetime.fromisoformat)
+    monkeypatch.setattr(feed_module, "datetime", clock)
+    second = await coordinator._async_update_data()
+
+    assert api.calls[-1]["known_last_update"] == "2025-01-01T12:00:00Z"
+    assert [f["flightId"] for f in second["flights"]] == ["A1"]
@@ -0,0 +1,34 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.avinor_flight_data.hub import ClientHub
+
+
+@pytest.mark.asyncio
+async def test_session_is_shared_by_both_clients():
+    hub = ClientHub(aiohttp.ClientSession())
+
+    assert hub.avinor._session is hub.session and hub.airlabs._session is hub.session
+    assert hub.airlabs._response_cache is hub.avinor._response_cache is hub.response_cache
+    assert hub.airlabs._single_flight is hub.avinor._single_flight
+
+    await hub.async_close()
+    await hub.async_close()
+    assert hub.session.closed
+
+
+def test_hub_reports_when_the_last_entry_releases_it():
+    hub = ClientHub(None, owns_session=False)
+
+    hub.acquire()
+    hub.acquire()
+    assert hub.release() is False
+    assert hub.in_use
+    assert hub.release() is True
+    assert not hub.in_use
+    # Extra releases (e.g. a failed setup) don't go negative.
+    assert hub.release() is True
+    hub.acquire()
+    assert hub.in_use
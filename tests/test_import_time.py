@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+# Run in a fresh interpreter with the Home Assistant stubs. aiohttp and
+# voluptuous are imported up front since Home Assistant has them loaded
+# before any integration.
+_PROBE = """
+import json, sys
+sys.path[:0] = [{tests!r}, {root!r}]
+import conftest, aiohttp, voluptuous
+
+import custom_components.avinor_flight_data
+import custom_components.avinor_flight_data.sensor
+
+lazy = ["xmltodict", "custom_components.avinor_flight_data.airlabs", "custom_components.avinor_flight_data.airport_table"]
+print(json.dumps([name for name in lazy if name in sys.modules]))
+"""
+
+
+def test_package_import_leaves_parsers_and_airlabs_unloaded():
+    tests = Path(__file__).parent
+    probe = _PROBE.format(tests=str(tests), root=str(tests.parent))
+    loaded = json.loads(subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True).stdout)
+
+    # Parsers and Airlabs code load on first use, not at setup.
+    assert loaded == []
@@ -0,0 +1,66 @@
+import copy
+import pickle
+
+import pytest
+
+from custom_components.avinor_flight_data.models import FLIGHT_FIELDS, FlightRecord, diff_flights, flight_as_dict
+
+
+def test_flight_record_reads_like_a_dict_and_is_immutable():
+    record = FlightRecord(uniqueId="u1", flightId="DY123", gate="A12", status_code="BRD")
+
+    assert record["flightId"] == "DY123"
+    assert record.get("gate") == "A12"
+    assert record.get("unknown", "x") == "x"
+    assert dict(record) == flight_as_dict(record)
+    assert list(flight_as_dict(record)) == list(FLIGHT_FIELDS)
+    assert not hasattr(record, "__dict__")
+
+    with pytest.raises(AttributeError):
+        record.gate = "B1"
+    with pytest.raises(KeyError):
+        record["unknown"]
+
+    assert record.replace(gate="B1")["gate"] == "B1"
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert copy.deepcopy(record) == record
+
+
+def test_diff_flights_reports_added_removed_and_changed_fields():
+    previous = [
+        FlightRecord(uniqueId="u1", flightId="DY1", gate="A1"),
+        FlightRecord(uniqueId="u2", flightId="DY2"),
+        FlightRecord(uniqueId="u3", flightId="DY3", status_code=None),
+    ]
+    current = [
+        FlightRecord(uniqueId="u1", flightId="DY1", gate="A1"),
+        FlightRecord(uniqueId="u3", flightId="DY3", status_code="D", status_time="2025-01-01T12:00:00Z"),
+        FlightRecord(uniqueId="u4", flightId="DY4"),
+    ]
+
+    delta = diff_flights(previous, current)
+
+    assert delta.added == ("u4",)
+    assert delta.removed == ("u2",)
+    assert delta.changed == {"u3": ("status_code", "status_time")}
+    assert not diff_flights(current, list(current))
+
+
+def test_build_flight_index_matches_linear_filters():
+    from custom_components.avinor_flight_data.models import build_flight_index
+    from custom_components.avinor_flight_data.sensor import _apply_flight_type_filter
+
+    flights = [
+        FlightRecord(uniqueId="u1", airline="DY", dom_int="D", arr_dep="A"),
+        FlightRecord(uniqueId="u2", airline="SK", dom_int=" s", arr_dep="D"),
+        FlightRecord(uniqueId="u3", airline="DY", dom_int="D", arr_dep="D"),
+        FlightRecord(uniqueId="u4", airline=None, dom_int=None, arr_dep="A"),
+    ]
+
+    index = build_flight_index(flights)
+
+    for dom_int in ("D", "S"):
+        assert list(index["dom_int"][dom_int]) == list(_apply_flight_type_filter(flights, dom_int))
+    assert [f.uniqueId for f in index["arr_dep"]["D"]] == ["u2", "u3"]
+    assert [f.uniqueId for f in index["airline"]["DY"]] == ["u1", "u3"]
+    assert [f.uniqueId for f in index["dom_int"][""]] == ["u4"]
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.avinor_flight_data.airlabs import AirlabsApiClient
+from custom_components.avinor_flight_data.quota import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    AirlabsBudgetExceeded,
+    AirlabsQuotaScheduler,
+)
+
+
+class RecordingAirlabsClient(AirlabsApiClient):
+    def __init__(self, budget):
+        super().__init__(session=None, budget=budget)
+        self.calls = []
+
+    async def _get_json(self, url, params=None):
+        self.calls.append(url)
+        return {"response": {"flight_iata": params.get("flight_iata")}}
+
+
+@pytest.mark.asyncio
+async def test_background_requests_keep_reserve_for_interactive_calls():
+    budget = AirlabsQuotaScheduler()
+    bucket = budget.configure("key", monthly_quota=200)  # burst of 10 requests, reserve of 2
+
+    for _ in range(8):
+        await budget.acquire("key", priority=PRIORITY_BACKGROUND)
+    with pytest.raises(AirlabsBudgetExceeded):
+        await budget.acquire("key", priority=PRIORITY_BACKGROUND)
+
+    client = RecordingAirlabsClient(budget)
+    details = await client.async_get_flight_details(api_key="key", flight_iata="DY123")
+    assert details == {"flight_iata": "DY123"}
+    assert bucket.consumed == 9
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_are_served_by_priority():
+    budget = AirlabsQuotaScheduler()
+    bucket = budget.configure("key", monthly_quota=20)  # single-token bucket
+    await budget.acquire("key", priority=PRIORITY_INTERACTIVE)
+    # Refill quickly so the test does not wait for the real monthly rate.
+    bucket.refill_per_second = 20.0
+
+    order = []
+
+    async def request(name, priority):
+        await budget.acquire("key", priority=priority)
+        order.append(name)
+
+    async def request_background():
+        await budget.acquire("key", priority=PRIORITY_BACKGROUND, max_wait=5)
+        order.append("background")
+
+    background = asyncio.ensure_future(request_background())
+    await asyncio.sleep(0)
+    interactive = asyncio.ensure_future(request("interactive", PRIORITY_INTERACTIVE))
+    await asyncio.gather(background, interactive)
+
+    assert order == ["interactive", "background"]
+
+
+def test_poll_interval_stretches_when_budget_runs_low():
+    budget = AirlabsQuotaScheduler()
+    bucket = budget.configure("key", monthly_quota=1000)
+    budget.register_poller("key", "entry_a")
+    base = timedelta(seconds=180)
+
+    assert budget.poll_interval("key", base) == base
+
+    bucket._tokens = 0
+    bucket.refill_per_second = 1000 / (30 * 24 * 3600)
+    stretched = budget.poll_interval("key", base, requests_per_poll=2)
+    # Two requests per poll on a 1000/month plan: one poll every ~86 minutes.
+    assert stretched > timedelta(minutes=80)
+
+    budget.register_poller("key", "entry_b")
+    assert budget.poll_interval("key", base, requests_per_poll=2) > stretched * 1.9
+
+
+class ScheduleThenAirportClient(AirlabsApiClient):
+    def __init__(self, budget):
+        super().__init__(session=None, budget=budget)
+        self.calls = []
+
+    async def _get_json(self, url, params=None):
+        self.calls.append(url.rsplit("/", 1)[-1])
+        if url.endswith("/schedules"):
+            arr_time = (datetime.now(timezone.utc) + timedelta(minutes=30)).strftime("%Y-%m-%d %H:%M")
+            return {"response": [{"flight_iata": "XX1", "dep_iata": "ZZZ", "arr_iata": "OSL", "arr_time_utc": arr_time}]}
+        return {"response": [{"iata_code": "ZZZ", "country_code": "US"}]}
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_during_airport_lookup_keeps_the_schedules():
+    budget = AirlabsQuotaScheduler()
+    bucket = budget.configure("key", monthly_quota=200)  # 8 background tokens
+    for _ in range(7):
+        await budget.acquire("key", priority=PRIORITY_BACKGROUND)
+
+    client = ScheduleThenAirportClient(budget)
+    result = await client.async_get_schedules(api_key="key", airport="OSL", direction="A", time_from=0, time_to=2)
+
+    # The page took the last background token; the unknown airport goes unclassified.
+    assert client.calls == ["schedules"]
+    assert [(flight["flightId"], flight["dom_int"]) for flight in result["flights"]] == [("XX1", "")]
+    assert bucket.consumed == 8
+    assert client._airport_cache.get("ZZZ") is None
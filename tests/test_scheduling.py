@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.avinor_flight_data.coordinator import AvinorCoordinator
+from custom_components.avinor_flight_data.models import FlightDelta
+from custom_components.avinor_flight_data.scheduling import FeedCadence, RefreshStagger, traffic_interval
+
+BASE = timedelta(seconds=180)
+NOON = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _flight(minutes_from_now, status_code=None, now=NOON):
+    schedule_time = (now + timedelta(minutes=minutes_from_now)).isoformat().replace("+00:00", "Z")
+    return {"uniqueId": str(minutes_from_now), "schedule_time": schedule_time, "status_code": status_code}
+
+
+def test_traffic_interval_follows_the_window():
+    assert traffic_interval([_flight(10)], base=BASE, now=NOON) == timedelta(seconds=60)
+    # Flights that already landed no longer need fast polling.
+    assert traffic_interval([_flight(10, "A")], base=BASE, now=NOON) == BASE
+    assert traffic_interval([_flight(180)], base=BASE, now=NOON) == BASE
+    assert traffic_interval([], base=BASE, now=NOON) == timedelta(seconds=600)
+
+    night = datetime(2025, 6, 1, 1, 0, tzinfo=timezone.utc)
+    assert traffic_interval([_flight(180, now=night)], base=BASE, now=night, tz=timezone.utc) == timedelta(seconds=600)
+
+    status_change = FlightDelta((), (), {"180": ("status_code",)})
+    assert traffic_interval([_flight(180)], base=BASE, delta=status_change, now=NOON) == timedelta(seconds=60)
+
+
+def test_feed_cadence_lands_polls_after_next_update():
+    cadence = FeedCadence()
+    cadence.observe("2025-06-01T12:00:00Z")
+    cadence.observe("2025-06-01T12:02:00Z")
+    cadence.observe("2025-06-01T12:04:00Z")
+    assert cadence.period == 120
+
+    # Next update expected at 12:06:00; poll 10 seconds after it.
+    now = datetime(2025, 6, 1, 12, 4, 30, tzinfo=timezone.utc)
+    assert cadence.align(BASE, now=now) == timedelta(seconds=100)
+    # Never shorter than the fast interval, never longer than requested.
+    late = datetime(2025, 6, 1, 12, 5, 50, tzinfo=timezone.utc)
+    assert cadence.align(BASE, now=late) == timedelta(seconds=60)
+    assert cadence.align(timedelta(seconds=30), now=now) == timedelta(seconds=30)
+
+
+class StaticApi:
+    def __init__(self, payload):
+        self._payload = payload
+
+    async def async_get_flights(self, **kwargs):
+        return self._payload
+
+
+@pytest.mark.asyncio
+async def test_coordinator_adapts_update_interval():
+    now = datetime.now(timezone.utc)
+    api = StaticApi({"lastUpdate": "2025-06-01T12:00:00Z", "flights": [_flight(5, now=now)]})
+    coordinator = AvinorCoordinator(None, api, None, {"airport": "OSL"}, update_interval=BASE)
+
+    await coordinator._async_update_data()
+
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+
+class FailingApi:
+    async def async_get_flights(self, **kwargs):
+        raise RuntimeError("offline")
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_retries_at_the_base_interval():
+    coordinator = AvinorCoordinator(None, FailingApi(), None, {"airport": "OSL"}, update_interval=BASE)
+
+    data = await coordinator._async_update_data()
+
+    # The empty placeholder is not an empty window: no quiet interval.
+    assert data == {"lastUpdate": None, "flights": []}
+    assert coordinator.update_interval == BASE
+
+
+def test_refresh_stagger_spreads_groups_over_the_interval():
+    stagger = RefreshStagger()
+    slots = [stagger.register(f"feed:{code}", f"entry_{code}") for code in ("OSL", "BGO", "TRD", "SVG")]
+    shared = stagger.register("feed:OSL", "entry_OSL_departures")
+
+    now = datetime(2025, 6, 1, 12, 0, 7, tzinfo=timezone.utc)
+    fire_at = sorted((now + slot.align(BASE, now=now)).timestamp() % 180 for slot in slots)
+    gaps = [later - earlier for earlier, later in zip(fire_at, fire_at[1:])]
+    # Four groups over 180 s: roughly 45 s apart, never bunched together.
+    assert all(30 <= gap <= 60 for gap in gaps)
+
+    # Entries sharing a feed stay within a few seconds of each other.
+    assert abs(shared.align(BASE, now=now) - slots[0].align(BASE, now=now)) <= timedelta(seconds=5)
+    # Deterministic and never further than 1.5 intervals away.
+    assert slots[1].align(BASE, now=now) == slots[1].align(BASE, now=now)
+    assert all(BASE / 2 <= slot.align(BASE, now=now) < BASE * 1.5 for slot in slots)
+
+
+def test_stagger_keeps_the_feed_cadence_target():
+    stagger = RefreshStagger()
+    codes = ("OSL", "BGO", "TRD", "SVG", "TOS")
+    slots = [stagger.register(f"feed:{code}", f"entry_{code}") for code in codes]
+    stagger.register("feed:OSL", "entry_OSL_departures")
+
+    # Polls already timed to a publish are spread over a few seconds,
+    # not over the whole interval.
+    jitter = [slot.jitter(timedelta(seconds=15)) for slot in slots]
+    assert len(set(jitter)) == len(codes)
+    assert all(timedelta(0) <= offset <= timedelta(seconds=15) for offset in jitter)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fast_poll_stays_on_the_publish_cadence():
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    stamps = [(now - timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z") for minutes in (6, 3, 0)]
+    api = StaticApi(None)
+    stagger = RefreshStagger()
+    coordinator = AvinorCoordinator(
+        None, api, None, {"airport": "OSL"}, update_interval=BASE, stagger=stagger.register("feed:OSL", "entry")
+    )
+
+    for stamp in stamps:
+        api._payload = {"lastUpdate": stamp, "flights": [_flight(5, now=now)]}
+        await coordinator._async_update_data()
+
+    # Fast poll (60 s), never moved to a slot up to 1.5 intervals away.
+    assert timedelta(seconds=60) <= coordinator.update_interval <= timedelta(seconds=75)
+
+
+def test_first_refresh_after_restart_is_spread_within_one_interval():
+    stagger = RefreshStagger()
+    codes = ("OSL", "BGO", "TRD", "SVG", "TOS")
+    slots = [stagger.register(f"feed:{code}", f"entry_{code}") for code in codes]
+
+    now = datetime(2025, 6, 1, 12, 6, 30, tzinfo=timezone.utc)
+    first = [slot.first_delay(BASE, now=now) for slot in slots]
+    assert len(set(first)) == len(codes)
+    assert all(timedelta(0) <= delay < BASE for delay in first)
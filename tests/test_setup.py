@@ -0,0 +1,94 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import voluptuous as vol
+
+import custom_components.avinor_flight_data as integration
+from custom_components.avinor_flight_data import (
+    _async_acquire_client_hub,
+    _async_get_client_hub,
+    _async_register_services,
+    _async_release_client_hub,
+    async_setup_entry,
+)
+from custom_components.avinor_flight_data.api import AvinorApiClient
+from custom_components.avinor_flight_data.const import DOMAIN
+
+from conftest import _HomeAssistant
+
+
+@pytest.mark.asyncio
+async def test_setup_does_not_wait_for_the_first_refresh(monkeypatch):
+    upstream = asyncio.Event()
+
+    async def slow_get_flights(self, **kwargs):
+        await upstream.wait()
+        return {"lastUpdate": "2025-01-01T12:00:00Z", "flights": [{"uniqueId": "1", "flightId": "DY123", "arr_dep": "A"}]}
+
+    monkeypatch.setattr(AvinorApiClient, "async_get_flights", slow_get_flights)
+
+    forwarded = []
+    background = []
+
+    async def forward(entry, platforms):
+        forwarded.append(entry.entry_id)
+
+    hass = _HomeAssistant()
+    hass.config = SimpleNamespace(time_zone="Europe/Oslo")
+    hass.config_entries.async_forward_entry_setups = forward
+    entry = SimpleNamespace(
+        entry_id="entry",
+        data={"airport": "OSL", "direction": "A", "time_from": 1, "time_to": 7},
+        options={},
+        async_create_background_task=lambda hass, target, name: background.append(asyncio.ensure_future(target)),
+        async_on_unload=lambda func: None,
+        add_update_listener=lambda listener: None,
+    )
+
+    assert await asyncio.wait_for(async_setup_entry(hass, entry), timeout=1)
+
+    # Entities are set up while upstream is still answering; they show as loading.
+    coordinator = hass.data[DOMAIN]["entry"]["coordinator"]
+    assert forwarded == ["entry"]
+    assert coordinator.data is None
+
+    upstream.set()
+    await asyncio.gather(*background)
+    assert coordinator.data["flights"][0]["flightId"] == "DY123"
+
+
+def test_service_schema_keeps_query_items_in_flight_batches():
+    registered = {}
+    hass = _HomeAssistant()
+    hass.services = SimpleNamespace(
+        async_register=lambda domain, service, handler, schema=None, **kwargs: registered.update(schema=schema),
+        async_remove=lambda *args: None,
+    )
+
+    _async_register_services(hass)
+    data = registered["schema"]({"flights": ["DY1", {"flight_icao": "NAX1"}, 123]})
+
+    assert data["flights"] == ["DY1", {"flight_icao": "NAX1"}, "123"]
+    with pytest.raises(vol.Invalid):
+        registered["schema"]({"flights": [{"flight": "DY1"}]})
+
+
+@pytest.mark.asyncio
+async def test_client_hub_outlives_a_reload_and_is_dropped_when_idle(monkeypatch):
+    monkeypatch.setattr(integration, "HUB_IDLE_CLOSE_SECONDS", 0.01)
+    hass = _HomeAssistant()
+
+    hub = await _async_get_client_hub(hass)
+    _async_acquire_client_hub(hass, hub)
+    # A reload: unload and set up again before the idle delay runs out.
+    _async_release_client_hub(hass, hub)
+    assert await _async_get_client_hub(hass) is hub
+    _async_acquire_client_hub(hass, hub)
+    await asyncio.sleep(0.02)
+    assert hass.data[DOMAIN]["clients"] is hub
+
+    _async_release_client_hub(hass, hub)
+    await asyncio.sleep(0.02)
+    assert "clients" not in hass.data[DOMAIN]
+    assert "clients_idle" not in hass.data[DOMAIN]
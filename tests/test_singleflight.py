@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from custom_components.avinor_flight_data.airlabs import AirlabsApiClient
+from custom_components.avinor_flight_data.api import AvinorApiClient
+from custom_components.avinor_flight_data.singleflight import SingleFlight
+
+FLIGHTS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<airport name="OSL">
+  <flights lastUpdate="2025-01-01T12:00:00Z">
+    <flight uniqueID="1"><flight_id>DY123</flight_id><arr_dep>A</arr_dep></flight>
+  </flights>
+</airport>
+"""
+
+
+class SlowResponse:
+    status = 200
+    headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    async def text(self):
+        await asyncio.sleep(0.01)
+        return FLIGHTS_XML
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return SlowResponse()
+
+
+class CountingAirlabsClient(AirlabsApiClient):
+    def __init__(self, single_flight):
+        super().__init__(session=None, single_flight=single_flight)
+        self.calls = 0
+
+    async def _get_json(self, url, params=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"response": {"flight_iata": params["flight_iata"]}}
+
+
+@pytest.mark.asyncio
+async def test_identical_avinor_requests_share_one_download():
+    session = CountingSession()
+    single_flight = SingleFlight()
+    first = AvinorApiClient(session, single_flight=single_flight)
+    second = AvinorApiClient(session, single_flight=single_flight)
+
+    results = await asyncio.gather(
+        first.async_get_flights(airport="OSL", direction="A"),
+        second.async_get_flights(airport="OSL", direction="A"),
+        second.async_get_flights(airport="OSL", direction="D"),
+    )
+
+    assert session.calls == 2
+    assert results[0] == results[1]
+    assert results[0]["flights"][0]["flightId"] == "DY123"
+    assert len(single_flight) == 0
+
+    # Nothing is kept once the request finished.
+    await first.async_get_flights(airport="OSL", direction="A")
+    assert session.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_identical_airlabs_requests_share_one_call():
+    single_flight = SingleFlight()
+    clients = [CountingAirlabsClient(single_flight) for _ in range(2)]
+
+    details = await asyncio.gather(
+        *(client.async_get_flight_details(api_key="key", flight_iata="DY123") for client in clients)
+    )
+
+    assert details == [{"flight_iata": "DY123"}] * 2
+    assert sum(client.calls for client in clients) == 1
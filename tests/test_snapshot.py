@@ -0,0 +1,61 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from custom_components.avinor_flight_data.coordinator import AvinorCoordinator
+from custom_components.avinor_flight_data.models import FlightRecord
+from custom_components.avinor_flight_data.snapshot import SnapshotStore
+
+from conftest import _Store
+
+SOURCE = "avinor:OSL:D:1:7"
+
+
+def _data():
+    flight = FlightRecord.from_mapping({"uniqueId": "1", "flightId": "DY123", "status": "D"})
+    return {"lastUpdate": "2025-01-01T12:00:00Z", "flights": [flight]}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_survives_restart_and_expires(monkeypatch):
+    store = _Store(None, 1, "avinor_flight_data.snapshots")
+    SnapshotStore(store).slot("entry", source=SOURCE).save(_data())
+
+    restarted = SnapshotStore(store, max_age=60)
+    await restarted.async_load()
+    restored = restarted.get("entry", source=SOURCE)
+    assert restored["lastUpdate"] == "2025-01-01T12:00:00Z"
+    assert restored["flights"][0]["flightId"] == "DY123"
+    assert isinstance(restored["flights"][0], FlightRecord)
+
+    # A changed airport/direction/window, or an old snapshot, is not served.
+    assert restarted.get("entry", source="avinor:BGO:D:1:7") is None
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert restarted.get("entry", source=SOURCE) is None
+
+    restarted.remove("entry")
+    assert store.data == {"entries": {}}
+
+
+class FailingApi:
+    async def async_get_flights(self, **kwargs):
+        raise RuntimeError("offline")
+
+
+@pytest.mark.asyncio
+async def test_coordinator_starts_from_snapshot_and_keeps_it_on_failure():
+    snapshots = SnapshotStore(_Store(None, 1, "avinor_flight_data.snapshots"))
+    slot = snapshots.slot("entry", source=SOURCE)
+    slot.save(_data())
+
+    coordinator = AvinorCoordinator(
+        None, FailingApi(), None, {"airport": "OSL"}, update_interval=timedelta(seconds=180), snapshot=slot
+    )
+    assert coordinator.restore_snapshot()
+    assert not coordinator.data["delta"]
+    assert coordinator.data["flights"][0]["uniqueId"] == "1"
+
+    data = await coordinator._async_update_data()
+    assert data["flights"][0]["flightId"] == "DY123"